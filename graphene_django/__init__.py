@@ -1,4 +1,5 @@
-from .fields import DjangoConnectionField, DjangoListField
+from .annotations import DjangoAnnotatedField
+from .fields import DjangoConnectionField, DjangoListField, DjangoNodesField
 from .types import DjangoObjectType
 
 __version__ = "2.15.0"
@@ -8,4 +9,6 @@ __all__ = [
     "DjangoObjectType",
     "DjangoListField",
     "DjangoConnectionField",
+    "DjangoNodesField",
+    "DjangoAnnotatedField",
 ]
@@ -0,0 +1,157 @@
+from collections import OrderedDict
+
+from django.db.models import Count
+from django.db.models.query import QuerySet
+
+from graphene import (
+    Boolean,
+    Date,
+    DateTime,
+    Decimal,
+    Field,
+    Float,
+    Int,
+    ObjectType,
+    String,
+)
+from graphene.utils.str_converters import to_camel_case
+
+from .utils import get_selected_field_names, maybe_queryset
+
+AGGREGATE_TYPES = {
+    "AutoField": Int,
+    "BigAutoField": Int,
+    "BigIntegerField": Int,
+    "IntegerField": Int,
+    "PositiveIntegerField": Int,
+    "PositiveSmallIntegerField": Int,
+    "SmallAutoField": Int,
+    "SmallIntegerField": Int,
+    "FloatField": Float,
+    "DecimalField": Decimal,
+    "DateField": Date,
+    "DateTimeField": DateTime,
+    "BooleanField": Boolean,
+    "NullBooleanField": Boolean,
+}
+
+# Name of the field of the connections exposing their aggregates
+AGGREGATES_FIELD = "aggregates"
+
+# Name of the field returning the number of items of the connection
+COUNT_FIELD = "count"
+
+
+def get_aggregate_type(model, expression):
+    """
+    Return the graphene scalar of the value of the aggregate `expression`
+    on `model`.
+    """
+    resolved = expression.resolve_expression(model._default_manager.all().query)
+    return get_scalar_type(resolved.output_field)
+
+
+def get_scalar_type(output_field):
+    return AGGREGATE_TYPES.get(output_field.get_internal_type(), String)
+
+
+def get_selected_aggregates(aggregates, info, path=()):
+    """
+    Return the expressions of the `aggregates` selected on `path` from the
+    field being resolved, with a count of the items if selected.
+    """
+    selected = set(get_selected_field_names(info, path))
+    expressions = OrderedDict(
+        (name, expression)
+        for name, expression in aggregates.items()
+        if name in selected or to_camel_case(name) in selected
+    )
+    if COUNT_FIELD in selected:
+        expressions[COUNT_FIELD] = Count("*")
+    return expressions
+
+
+def compute_aggregates(connection_type, queryset, info):
+    """
+    Compute the aggregates of `connection_type` selected in the query and
+    the number of items of `queryset`, with a single `aggregate()` call, or
+    return None if no aggregates are selected.
+    """
+    aggregates = getattr(connection_type, "aggregate_expressions", None)
+    if (
+        aggregates is None
+        or not isinstance(queryset, QuerySet)
+        or AGGREGATES_FIELD not in get_selected_field_names(info)
+    ):
+        return None
+    expressions = get_selected_aggregates(aggregates, info, (AGGREGATES_FIELD,))
+    expressions[COUNT_FIELD] = Count("*")
+    return queryset.order_by().aggregate(**expressions)
+
+
+def resolve_aggregates(aggregates, root, info):
+    """
+    Return the aggregates computed along with the connection, or compute the
+    selected ones with a single `aggregate()` call on its queryset.
+    """
+    aggregated = getattr(root, "aggregated", None)
+    if aggregated is not None:
+        return aggregated
+
+    queryset = maybe_queryset(root.iterable)
+    assert isinstance(
+        queryset, QuerySet
+    ), "Aggregates can only be computed on connections resolving to a QuerySet."
+
+    expressions = get_selected_aggregates(aggregates, info)
+    if not expressions:
+        return {}
+    return queryset.order_by().aggregate(**expressions)
+
+
+_aggregates_connections = {}
+
+
+def get_aggregates_connection(connection_type, aggregates, name=None):
+    """
+    Return a subclass of `connection_type` with an `aggregates` field
+    exposing `aggregates`, a mapping of field names to Django aggregate
+    expressions. The type of the field is named `name`, by default the name
+    of the node followed by "Aggregates": pass a `name` to expose different
+    aggregates of a node in the same schema.
+    """
+    assert COUNT_FIELD not in aggregates, (
+        'The "{}" aggregate is reserved for the number of items.'
+    ).format(COUNT_FIELD)
+    node = connection_type._meta.node
+    name = name or "{}Aggregates".format(node._meta.name)
+    key = (connection_type, tuple(sorted(aggregates.items())), name)
+    if key in _aggregates_connections:
+        return _aggregates_connections[key]
+
+    model = node._meta.model
+    fields = OrderedDict(
+        (field_name, Field(get_aggregate_type(model, expression)))
+        for field_name, expression in aggregates.items()
+    )
+    fields[COUNT_FIELD] = Field(Int)
+    aggregates_type = type(str(name), (ObjectType,), fields)
+
+    def resolve(root, info):
+        return resolve_aggregates(aggregates, root, info)
+
+    aggregates_connection = type(
+        str("{}Connection".format(name)),
+        (connection_type,),
+        {
+            AGGREGATES_FIELD: Field(aggregates_type, resolver=resolve),
+            "aggregate_expressions": aggregates,
+            "Meta": type(str("Meta"), (object,), {"node": node}),
+        },
+    )
+    _aggregates_connections[key] = aggregates_connection
+    return aggregates_connection
+
+
+def has_aggregates(connection_type):
+    return getattr(connection_type, "aggregate_expressions", None) is not None
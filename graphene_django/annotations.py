@@ -0,0 +1,102 @@
+from collections import OrderedDict
+from functools import partial
+
+from django.core.exceptions import FieldError
+from django.db.models.query import QuerySet
+
+from graphene import Field
+
+from .aggregates import get_aggregate_type, get_scalar_type
+from .utils import get_selected_field_names, maybe_queryset
+
+# Prefix of the annotations of the fields, as they can't shadow model fields
+ANNOTATION_PREFIX = "_graphene_"
+
+
+class DjangoAnnotatedField(Field):
+    """
+    Field of a DjangoObjectType resolving to the value of a Django
+    expression, e.g. `Count("articles")` or `Exists(...)`, annotated on the
+    querysets of the type when the field is selected. The field type is
+    inferred from the output field of the expression if not given.
+    """
+
+    def __init__(self, expression, _type=None, *args, **kwargs):
+        self.expression = expression
+        self.model = None
+        self.annotation = None
+        super(DjangoAnnotatedField, self).__init__(
+            _type or (lambda: self.get_default_type()), *args, **kwargs
+        )
+
+    def bind(self, model, name):
+        self.model = model
+        self.annotation = ANNOTATION_PREFIX + name
+
+    def get_default_type(self):
+        try:
+            output_field = self.expression.output_field
+        except (AttributeError, FieldError):
+            return get_aggregate_type(self.model, self.expression)
+        return get_scalar_type(output_field)
+
+    @staticmethod
+    def annotation_resolver(annotation, expression, root, info, **args):
+        if hasattr(root, annotation):
+            return getattr(root, annotation)
+        # The object wasn't fetched through an annotated queryset, e.g. it was
+        # returned by a custom resolver
+        return (
+            root._meta.default_manager.filter(pk=root.pk)
+            .annotate(**{annotation: expression})
+            .values_list(annotation, flat=True)
+            .first()
+        )
+
+    def get_resolver(self, parent_resolver):
+        return partial(self.annotation_resolver, self.annotation, self.expression)
+
+
+def get_annotated_fields(cls):
+    """
+    Return the DjangoAnnotatedFields declared on `cls` and its bases by name.
+    """
+    fields = OrderedDict()
+    for base in reversed(cls.__mro__):
+        for name, value in vars(base).items():
+            if isinstance(value, DjangoAnnotatedField):
+                fields[name] = value
+    return fields
+
+
+def annotate_queryset(queryset, django_object_type, info, path=()):
+    """
+    Annotate `queryset` with the DjangoAnnotatedFields of
+    `django_object_type` selected on `path` from the field being resolved.
+    """
+    annotated_fields = getattr(django_object_type._meta, "annotated_fields", None)
+    if not annotated_fields:
+        return queryset
+
+    from .values import get_graphql_fields
+
+    selected = get_selected_field_names(info, path)
+    fields = get_graphql_fields(django_object_type, info)
+    annotations = OrderedDict()
+    for graphql_name in selected:
+        name, field = fields.get(graphql_name, (None, None))
+        if name in annotated_fields:
+            annotations[field.annotation] = field.expression
+    if not annotations:
+        return queryset
+
+    # e.g. the manager returned by the default get_queryset
+    annotated = maybe_queryset(queryset)
+    if (
+        not isinstance(annotated, QuerySet)
+        # Sliced querysets can't be annotated, the fields fall back on a query
+        # per object
+        or not annotated.query.can_filter()
+    ):
+        return queryset
+    return annotated.annotate(**annotations)
@@ -0,0 +1,172 @@
+import uuid
+from copy import copy
+from functools import partial
+
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .annotations import ANNOTATION_PREFIX
+
+# Prefix of the cache keys of the nodes
+KEY_PREFIX = "graphene_django.node"
+
+
+def vary_by_user(info):
+    """
+    Key the entries on the user of the request, if any.
+    """
+    user = getattr(info.context, "user", None)
+    if user is None:
+        return ""
+    if not user.is_authenticated:
+        return "anonymous"
+    return "user-{}".format(user.pk)
+
+
+def get_generation_key(model):
+    return "{}.{}.generation".format(KEY_PREFIX, model._meta.label_lower)
+
+
+def invalidate(model, backend, **kwargs):
+    caches[backend].set(get_generation_key(model), uuid.uuid4().hex, None)
+
+
+def strip_annotations(node):
+    """
+    Return `node` without the values of its DjangoAnnotatedFields, which can
+    depend on other models whose changes don't invalidate the entries.
+    """
+    names = [name for name in vars(node) if name.startswith(ANNOTATION_PREFIX)]
+    if not names:
+        return node
+    node = copy(node)
+    for name in names:
+        delattr(node, name)
+    return node
+
+
+class NodeCache(object):
+    """
+    Cache of the nodes of a DjangoObjectType, shared between requests.
+
+    Set with `Meta.cache = {"ttl": ..., "backend": ..., "vary": ...}`:
+
+    - `ttl`: lifetime of the entries in seconds (the default timeout of the
+      backend if not set)
+    - `backend`: alias of the Django cache to use, "default" if not set
+    - `vary`: function of `info` returning a string, the entries are kept
+      apart for each value. As the nodes are fetched through `get_queryset`,
+      it must return different values for contexts that `get_queryset`
+      filters differently. Defaults to `vary_by_user`, None shares the
+      entries between all the requests.
+
+    All the entries of the model are invalidated when one of its instances
+    is saved or deleted, or when one of its many-to-many relations changes.
+    """
+
+    def __init__(self, model, name, ttl=None, backend="default", vary=vary_by_user):
+        self.model = model
+        self.name = name
+        self.ttl = ttl
+        self.backend = backend
+        self.vary = vary
+        self.hits = 0
+        self.misses = 0
+        self.connect_signals()
+
+    @property
+    def cache(self):
+        return caches[self.backend]
+
+    @property
+    def generation_key(self):
+        return get_generation_key(self.model)
+
+    def get_generation(self):
+        """
+        Return the token identifying the current entries of the model.
+        A new token, rather than an incremented counter, makes sure evicted
+        tokens never bring invalidated entries back.
+        """
+        generation = self.cache.get(self.generation_key)
+        if generation is None:
+            self.cache.add(self.generation_key, uuid.uuid4().hex, None)
+            generation = self.cache.get(self.generation_key)
+        return generation
+
+    def invalidate(self, **kwargs):
+        invalidate(self.model, self.backend)
+
+    def connect_signals(self):
+        # Once per model and backend, whatever the number of types caching
+        # its nodes
+        receiver = partial(invalidate, self.model, self.backend)
+        dispatch_uid = "{}.{}.{}".format(
+            KEY_PREFIX, self.model._meta.label_lower, self.backend
+        )
+        post_save.connect(
+            receiver, sender=self.model, weak=False, dispatch_uid=dispatch_uid
+        )
+        post_delete.connect(
+            receiver, sender=self.model, weak=False, dispatch_uid=dispatch_uid
+        )
+        for field in self.model._meta.many_to_many:
+            m2m_changed.connect(
+                receiver,
+                sender=field.remote_field.through,
+                weak=False,
+                dispatch_uid=dispatch_uid,
+            )
+
+    def get_pk(self, id):
+        try:
+            return self.model._meta.pk.to_python(id)
+        except ValidationError:
+            return None
+
+    def get_keys(self, info, pks):
+        generation = self.get_generation()
+        vary = self.vary(info) if self.vary else ""
+        return {
+            pk: "{}.{}.{}.{}.{}".format(KEY_PREFIX, self.name, generation, vary, pk)
+            for pk in pks
+        }
+
+    def get(self, info, id):
+        pk = self.get_pk(id)
+        if pk is None:
+            return None
+        return self.get_many(info, [pk]).get(pk)
+
+    def get_many(self, info, ids):
+        """
+        Return the cached nodes of `ids` by primary key.
+        """
+        pks = set(pk for pk in (self.get_pk(id) for id in ids) if pk is not None)
+        if not pks:
+            return {}
+        keys = self.get_keys(info, pks)
+        cached = self.cache.get_many(list(keys.values()))
+        nodes = {pk: cached[key] for pk, key in keys.items() if key in cached}
+        self.hits += len(nodes)
+        self.misses += len(pks) - len(nodes)
+        return nodes
+
+    def set_many(self, info, nodes):
+        if not nodes:
+            return
+        keys = self.get_keys(info, [node.pk for node in nodes])
+        self.cache.set_many(
+            {keys[node.pk]: strip_annotations(node) for node in nodes},
+            **self.get_timeout_kwargs()
+        )
+
+    def get_timeout_kwargs(self):
+        return {"timeout": self.ttl} if self.ttl is not None else {}
+
+    def get_stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+    def reset_stats(self):
+        self.hits = self.misses = 0
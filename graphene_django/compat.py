@@ -22,3 +22,9 @@ try:
     from django.db.models import JSONField
 except ImportError:
     JSONField = MissingType
+
+try:
+    # Window expressions are only available from Django 2.0
+    from django.db.models import Window
+except ImportError:
+    Window = None
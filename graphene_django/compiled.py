@@ -0,0 +1,484 @@
+"""
+GraphQL backend executing each operation of a document with an execution
+plan compiled on its first execution, for documents executed many times
+like persisted operations.
+"""
+import logging
+import sys
+from collections import OrderedDict
+
+from graphql import GraphQLError
+from graphql.backend.base import GraphQLBackend, GraphQLDocument
+from graphql.error import GraphQLLocatedError
+from graphql.execution import ExecutionResult, execute
+from graphql.execution.base import (
+    ResolveInfo,
+    default_resolve_fn,
+    get_field_def,
+    get_operation_root_type,
+)
+from graphql.execution.executors.sync import SyncExecutor
+from graphql.execution.middleware import MiddlewareManager
+from graphql.execution.utils import ExecutionContext, collect_fields
+from graphql.language import ast
+from graphql.language.parser import parse
+from graphql.language.printer import print_ast
+from graphql.pyutils.default_ordered_dict import DefaultOrderedDict
+from graphql.type import (
+    GraphQLEnumType,
+    GraphQLInterfaceType,
+    GraphQLList,
+    GraphQLNonNull,
+    GraphQLObjectType,
+    GraphQLScalarType,
+    GraphQLUnionType,
+)
+from graphql.validation import validate
+from promise import Promise, is_thenable
+from six import string_types
+
+# Resolver errors are logged like the default executor does
+logger = logging.getLogger("graphql.execution.executor")
+
+# Directives whose arguments change the fields to execute
+FIELD_DIRECTIVES = ("skip", "include")
+
+
+def get_directive_variables(document_ast):
+    """
+    Return the names of the variables used by the @skip and @include
+    directives of `document_ast`.
+    """
+    names = set()
+
+    def visit(node):
+        for directive in getattr(node, "directives", None) or []:
+            if directive.name.value in FIELD_DIRECTIVES:
+                for argument in directive.arguments:
+                    if isinstance(argument.value, ast.Variable):
+                        names.add(argument.value.name.value)
+        selection_set = getattr(node, "selection_set", None)
+        if selection_set:
+            for selection in selection_set.selections:
+                visit(selection)
+
+    for definition in document_ast.definitions:
+        visit(definition)
+    return sorted(names)
+
+
+class FieldPlan(object):
+    """
+    Field to resolve on the objects of a type, with its resolver and the
+    function completing its value.
+    """
+
+    __slots__ = (
+        "response_key",
+        "field_name",
+        "field_asts",
+        "field_def",
+        "return_type",
+        "parent_type",
+        "resolver",
+        "has_arguments",
+        "complete",
+    )
+
+    def __init__(self, response_key, field_asts, field_def, parent_type):
+        self.response_key = response_key
+        self.field_name = field_asts[0].name.value
+        self.field_asts = field_asts
+        self.field_def = field_def
+        self.return_type = field_def.type
+        self.parent_type = parent_type
+        self.resolver = field_def.resolver or default_resolve_fn
+        self.has_arguments = bool(field_def.args) or bool(field_asts[0].arguments)
+        self.complete = None
+
+
+class OperationCompiler(object):
+    """
+    Compile the execution plan of an operation: the fields to resolve for
+    each selection set, and a completion function per field type, so that
+    field collection, type dispatch and nullability checks are only worked
+    out once. Plans are shared by executions, so the compiler only keeps the
+    schema: the selection sets are collected with the context of the
+    execution compiling them.
+    """
+
+    def __init__(self, schema):
+        self.schema = schema
+        self._fields = {}
+
+    def get_fields(self, exe_context, object_type, field_asts):
+        """
+        Return the FieldPlans of the selection sets of `field_asts` on
+        `object_type`, compiled on first use as types can be recursive.
+        """
+        key = object_type, tuple(field_asts)
+        if key not in self._fields:
+            collected = DefaultOrderedDict(list)
+            visited_fragment_names = set()
+            for field_ast in field_asts:
+                if field_ast.selection_set:
+                    collected = collect_fields(
+                        exe_context,
+                        object_type,
+                        field_ast.selection_set,
+                        collected,
+                        visited_fragment_names,
+                    )
+            self._fields[key] = self.compile_fields(object_type, collected)
+        return self._fields[key]
+
+    def compile_fields(self, object_type, collected):
+        plans = []
+        for response_key, field_asts in collected.items():
+            field_def = get_field_def(
+                self.schema, object_type, field_asts[0].name.value
+            )
+            if not field_def:
+                continue
+            plan = FieldPlan(response_key, field_asts, field_def, object_type)
+            plan.complete = self.compile_value(plan.return_type, field_asts)
+            plans.append(plan)
+        return plans
+
+    def compile_value(self, return_type, field_asts):
+        """
+        Return the function completing the values of `return_type`,
+        catching the errors of nullable types.
+        """
+        complete = self.compile_type(return_type, field_asts)
+        if isinstance(return_type, GraphQLNonNull):
+            return complete
+
+        def complete_catching_error(execution, info, path, value):
+            try:
+                return complete(execution, info, path, value)
+            except Exception as e:
+                execution.report_error(e, sys.exc_info()[2])
+                return None
+
+        return complete_catching_error
+
+    def compile_type(self, return_type, field_asts):
+        if isinstance(return_type, GraphQLNonNull):
+            return self.compile_non_null(return_type, field_asts)
+        if isinstance(return_type, GraphQLList):
+            return self.compile_list(return_type, field_asts)
+        if isinstance(return_type, (GraphQLScalarType, GraphQLEnumType)):
+            return self.compile_leaf(return_type, field_asts)
+        if isinstance(return_type, (GraphQLInterfaceType, GraphQLUnionType)):
+            return self.compile_abstract(return_type, field_asts)
+        if isinstance(return_type, GraphQLObjectType):
+            return self.compile_object(return_type, field_asts)
+        assert False, u'Cannot complete value of unexpected type "{}".'.format(
+            return_type
+        )
+
+    def compile_non_null(self, return_type, field_asts):
+        complete_inner = self.compile_type(return_type.of_type, field_asts)
+
+        def complete(execution, info, path, value):
+            completed = complete_inner(execution, info, path, value)
+            if completed is None:
+                raise GraphQLError(
+                    "Cannot return null for non-nullable field {}.{}.".format(
+                        info.parent_type, info.field_name
+                    ),
+                    field_asts,
+                    path=path,
+                )
+            return completed
+
+        return with_resolved_value(complete, field_asts, nullable=False)
+
+    def compile_list(self, return_type, field_asts):
+        complete_item = self.compile_value(return_type.of_type, field_asts)
+
+        def complete(execution, info, path, value):
+            return [
+                complete_item(execution, info, path + [index], item)
+                for index, item in enumerate(value)
+            ]
+
+        return with_resolved_value(complete, field_asts)
+
+    def compile_leaf(self, return_type, field_asts):
+        serialize = return_type.serialize
+
+        def complete(execution, info, path, value):
+            serialized = serialize(value)
+            if serialized is None:
+                raise GraphQLError(
+                    ('Expected a value of type "{}" but ' + "received: {}").format(
+                        return_type, value
+                    ),
+                    path=path,
+                )
+            return serialized
+
+        return with_resolved_value(complete, field_asts)
+
+    def compile_object(self, object_type, field_asts):
+        is_type_of = object_type.is_type_of
+
+        def complete(execution, info, path, value):
+            if is_type_of and not is_type_of(value, info):
+                raise GraphQLError(
+                    u'Expected value of type "{}" but got: {}.'.format(
+                        object_type, type(value).__name__
+                    ),
+                    field_asts,
+                )
+            return execution.execute_fields(
+                self.get_fields(execution.exe_context, object_type, field_asts),
+                value,
+                path,
+            )
+
+        return with_resolved_value(complete, field_asts)
+
+    def compile_abstract(self, abstract_type, field_asts):
+        schema = self.schema
+        possible_types = schema.get_possible_types(abstract_type)
+        complete_objects = {}
+
+        def resolve_type(value, info):
+            if abstract_type.resolve_type:
+                runtime_type = abstract_type.resolve_type(value, info)
+                if isinstance(runtime_type, string_types):
+                    runtime_type = schema.get_type(runtime_type)
+                return runtime_type
+            for possible_type in possible_types:
+                if callable(possible_type.is_type_of) and possible_type.is_type_of(
+                    value, info
+                ):
+                    return possible_type
+            return None
+
+        def complete(execution, info, path, value):
+            runtime_type = resolve_type(value, info)
+            if not isinstance(runtime_type, GraphQLObjectType):
+                raise GraphQLError(
+                    (
+                        "Abstract type {} must resolve to an Object type at runtime "
+                        + 'for field {}.{} with value "{}", received "{}".'
+                    ).format(
+                        abstract_type,
+                        info.parent_type,
+                        info.field_name,
+                        value,
+                        runtime_type,
+                    ),
+                    field_asts,
+                )
+            if runtime_type not in complete_objects:
+                if not schema.is_possible_type(abstract_type, runtime_type):
+                    raise GraphQLError(
+                        u'Runtime Object type "{}" is not a possible type for "{}".'.format(
+                            runtime_type, abstract_type
+                        ),
+                        field_asts,
+                    )
+                complete_objects[runtime_type] = self.compile_object(
+                    runtime_type, field_asts
+                )
+            return complete_objects[runtime_type](execution, info, path, value)
+
+        return with_resolved_value(complete, field_asts)
+
+
+def with_resolved_value(complete, field_asts, nullable=True):
+    """
+    Wrap `complete` to wait for promised values, raise the errors returned
+    by resolvers and, for nullable types, complete None to None.
+    """
+
+    def complete_resolved(execution, info, path, value):
+        if is_thenable(value):
+            try:
+                value = Promise.resolve(value).get()
+            except Exception as e:
+                raise GraphQLLocatedError(field_asts, original_error=e, path=path)
+        if isinstance(value, Exception):
+            raise GraphQLLocatedError(field_asts, original_error=value, path=path)
+        if nullable and value is None:
+            return None
+        return complete(execution, info, path, value)
+
+    return complete_resolved
+
+
+class Execution(object):
+    """
+    Execution of a compiled operation.
+    """
+
+    def __init__(self, exe_context):
+        self.exe_context = exe_context
+        self.report_error = exe_context.report_error
+
+    def execute_fields(self, field_plans, source, path):
+        exe_context = self.exe_context
+        results = OrderedDict()
+        for plan in field_plans:
+            field_path = path + [plan.response_key]
+            info = ResolveInfo(
+                plan.field_name,
+                plan.field_asts,
+                plan.return_type,
+                plan.parent_type,
+                schema=exe_context.schema,
+                fragments=exe_context.fragments,
+                root_value=exe_context.root_value,
+                operation=exe_context.operation,
+                variable_values=exe_context.variable_values,
+                context=exe_context.context_value,
+                path=field_path,
+            )
+            args = (
+                exe_context.get_argument_values(plan.field_def, plan.field_asts[0])
+                if plan.has_arguments
+                else {}
+            )
+            resolver = exe_context.get_field_resolver(plan.resolver)
+            try:
+                value = resolver(source, info, **args)
+            except Exception as e:
+                logger.exception(
+                    "An error occurred while resolving field {}.{}".format(
+                        plan.parent_type.name, plan.field_name
+                    )
+                )
+                e.stack = sys.exc_info()[2]
+                value = e
+            results[plan.response_key] = plan.complete(self, info, field_path, value)
+        return results
+
+
+class CompiledDocument(GraphQLDocument):
+    """
+    Validated document caching the execution plans of its operations, by
+    operation name and values of the variables of @skip and @include.
+    """
+
+    def __init__(self, schema, document_string, document_ast, validation_errors):
+        super(CompiledDocument, self).__init__(
+            schema=schema,
+            document_string=document_string,
+            document_ast=document_ast,
+            execute=self.execute_compiled,
+        )
+        self.validation_errors = validation_errors
+        self.directive_variables = get_directive_variables(document_ast)
+        self.plans = {}
+
+    def get_plan(self, exe_context):
+        operation = exe_context.operation
+        key = (operation.name and operation.name.value,) + tuple(
+            exe_context.variable_values.get(name) for name in self.directive_variables
+        )
+        if key not in self.plans:
+            root_type = get_operation_root_type(exe_context.schema, operation)
+            self.plans[key] = OperationCompiler(exe_context.schema).compile_fields(
+                root_type,
+                collect_fields(
+                    exe_context,
+                    root_type,
+                    operation.selection_set,
+                    DefaultOrderedDict(list),
+                    set(),
+                ),
+            )
+        return self.plans[key]
+
+    def execute_compiled(
+        self,
+        root_value=None,
+        context_value=None,
+        variable_values=None,
+        operation_name=None,
+        middleware=None,
+        executor=None,
+        **options
+    ):
+        if self.validation_errors:
+            return ExecutionResult(errors=self.validation_errors, invalid=True)
+
+        operation_type = self.get_operation_type(operation_name)
+        if executor is not None or options or operation_type == "subscription":
+            # Asynchronous executors, promises and subscriptions are left to
+            # the default executor
+            return execute(
+                self.schema,
+                self.document_ast,
+                root_value=root_value,
+                context_value=context_value,
+                variable_values=variable_values,
+                operation_name=operation_name,
+                middleware=middleware,
+                executor=executor,
+                **options
+            )
+
+        if middleware and not isinstance(middleware, MiddlewareManager):
+            middleware = MiddlewareManager(*middleware)
+        exe_context = ExecutionContext(
+            self.schema,
+            self.document_ast,
+            root_value,
+            context_value,
+            variable_values or {},
+            operation_name,
+            SyncExecutor(),
+            middleware,
+            False,
+        )
+        plan = self.get_plan(exe_context)
+        execution = Execution(exe_context)
+        try:
+            data = execution.execute_fields(plan, root_value, [])
+        except Exception as e:
+            exe_context.errors.append(e)
+            data = None
+        if not exe_context.errors:
+            return ExecutionResult(data=data)
+        return ExecutionResult(data=data, errors=exe_context.errors)
+
+
+class GraphQLCompiledBackend(GraphQLBackend):
+    """
+    Backend validating each document once and executing its operations with
+    compiled execution plans. The `max_documents` most recently used
+    documents are kept.
+    """
+
+    def __init__(self, max_documents=1000):
+        self.max_documents = max_documents
+        self.documents = OrderedDict()
+
+    def document_from_string(self, schema, document_string):
+        if isinstance(document_string, ast.Document):
+            document_ast = document_string
+            document_string = print_ast(document_ast)
+        else:
+            assert isinstance(
+                document_string, string_types
+            ), "The query must be a string"
+            document_ast = None
+
+        key = schema, document_string
+        document = self.documents.pop(key, None)
+        if document is None:
+            if document_ast is None:
+                document_ast = parse(document_string)
+            document = CompiledDocument(
+                schema, document_string, document_ast, validate(schema, document_ast),
+            )
+            while len(self.documents) >= self.max_documents:
+                self.documents.popitem(last=False)
+        self.documents[key] = document
+        return document
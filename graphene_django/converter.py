@@ -21,14 +21,17 @@ from graphene import (
     Decimal,
 )
 from graphene.types.json import JSONString
+from graphene.types.resolver import get_default_resolver
 from graphene.utils.str_converters import to_camel_case
 from graphql import assert_valid_name
 
 from .settings import graphene_settings
 from .compat import ArrayField, HStoreField, JSONField, PGJSONField, RangeField
 from .fields import DjangoListField, DjangoConnectionField
+from .identity_map import get_identity_map
 from .utils import import_single_dispatch
 from .utils.str_converters import to_const
+from .values import ValuesRow
 
 singledispatch = import_single_dispatch()
 
@@ -265,11 +268,28 @@ def convert_field_to_djangomodel(field, registry=None):
                 it goes through the `get_queryset` method of the DjangoObjectType.
                 """
                 resolver = super(CustomField, self).get_resolver(parent_resolver)
+                # The related object can be looked up by the column value
+                # when it is read by the default resolver and holds its pk
+                lookup_column = (
+                    getattr(parent_resolver, "func", None) is get_default_resolver()
+                    and field.target_field.primary_key
+                )
 
                 def custom_resolver(root, info, **args):
+                    identity_map = get_identity_map(info, _type)
+                    if identity_map is not None and lookup_column:
+                        fk_obj = identity_map.get(
+                            model, getattr(root, field.attname, None)
+                        )
+                        if fk_obj is not None:
+                            return fk_obj
+
                     fk_obj = resolver(root, info, **args)
                     if fk_obj is None:
                         return None
+                    elif isinstance(fk_obj, ValuesRow):
+                        # Built by the database along with its parent
+                        return fk_obj
                     else:
                         return _type.get_node(info, fk_obj.pk)
 
@@ -0,0 +1,142 @@
+import json
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from six import string_types
+
+from .compat import Window
+
+COUNT_EXACT = "exact"
+COUNT_ESTIMATED = "estimated"
+COUNT_CAPPED = "capped"
+COUNT_WINDOW = "window"
+COUNT_STRATEGIES = (COUNT_EXACT, COUNT_ESTIMATED, COUNT_CAPPED, COUNT_WINDOW)
+
+# Annotation holding the window count on the items of a page
+WINDOW_COUNT_ANNOTATION = "_graphene_window_count"
+
+
+def is_unfiltered(queryset):
+    query = queryset.query
+    return (
+        not query.where
+        and not query.distinct
+        and query.low_mark == 0
+        and query.high_mark is None
+        and len(query.alias_map) <= 1
+    )
+
+
+def estimate_count(queryset):
+    """
+    Return the row estimate of the PostgreSQL planner for `queryset`, or
+    None if the database doesn't provide one.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    if queryset.query.is_empty():
+        # The SQL of `.none()` querysets can't be compiled
+        return 0
+
+    queryset = queryset.order_by()
+    with connection.cursor() as cursor:
+        if is_unfiltered(queryset):
+            # Maintained by VACUUM and ANALYZE, -1 or 0 if never analyzed
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [connection.ops.quote_name(queryset.model._meta.db_table)],
+            )
+            row = cursor.fetchone()
+            if row and row[0] > 0:
+                return int(row[0])
+
+        sql, params = queryset.query.get_compiler(using=queryset.db).as_sql()
+        cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+        plan = cursor.fetchone()[0]
+    if not isinstance(plan, list):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def is_total_ordering(queryset):
+    """
+    Whether the ordering of `queryset` ends with its primary key or another
+    unique and non-null field, leaving no ties between its rows.
+    """
+    query = queryset.query
+    if query.extra_order_by:
+        return False
+    ordering = query.order_by or (
+        query.default_ordering and queryset.model._meta.ordering
+    )
+    if not ordering or not isinstance(ordering[-1], string_types):
+        return False
+    name = ordering[-1].lstrip("-")
+    if name == "pk":
+        return True
+    try:
+        field = queryset.model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return False
+    return getattr(field, "unique", False) and not getattr(field, "null", True)
+
+
+def can_reverse(queryset):
+    """
+    Whether `queryset` can be fetched in the reverse order of its ordering,
+    which mirrors it only when the ordering leaves no ties.
+    """
+    query = queryset.query
+    return (
+        queryset.ordered
+        and not query.combinator
+        and query.low_mark == 0
+        and query.high_mark is None
+        and is_total_ordering(queryset)
+    )
+
+
+def supports_window_count(queryset):
+    """
+    Whether the total count of `queryset` can be annotated on its items
+    with `COUNT(*) OVER ()`. Windows are computed before DISTINCT so they
+    can't count distinct querysets.
+    """
+    query = queryset.query
+    return (
+        Window is not None
+        and getattr(connections[queryset.db].features, "supports_over_clause", False)
+        and not query.distinct
+        and not query.combinator
+        and query.low_mark == 0
+        and query.high_mark is None
+    )
+
+
+def count_queryset(queryset, strategy=COUNT_EXACT, cap=None):
+    """
+    Count the items of `queryset` following `strategy` and return the count
+    with whether it is exact:
+
+    - `exact`: `COUNT(*)`
+    - `estimated`: the row estimate of the planner, falling back to an exact
+      count on databases without one
+    - `capped`: `COUNT(*)` of at most `cap` + 1 rows, `cap` being returned as
+      an approximate count when there are more rows
+    - `window`: counted along with the page by the connection field, this
+      counts exactly
+    """
+    assert strategy in COUNT_STRATEGIES, 'Unknown count strategy "{}"'.format(strategy)
+    if strategy == COUNT_ESTIMATED:
+        count = estimate_count(queryset)
+        if count is not None:
+            return count, False
+
+    if strategy == COUNT_CAPPED and cap is not None:
+        count = queryset.order_by()[: cap + 1].count()
+        if count > cap:
+            return cap, False
+        return count, True
+
+    return queryset.count(), True
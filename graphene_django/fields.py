@@ -1,6 +1,8 @@
+from collections import OrderedDict, namedtuple
 from functools import partial
 
 import six
+from django.db.models import Count
 from django.db.models.query import QuerySet
 from graphql_relay.connection.arrayconnection import (
     connection_from_list_slice,
@@ -10,18 +12,59 @@ from graphql_relay.connection.arrayconnection import (
 )
 from promise import Promise
 
-from graphene import Int, NonNull
-from graphene.relay import ConnectionField, PageInfo
+from graphene import ID, Int, NonNull
+from graphene.relay import ConnectionField, Node, PageInfo
 from graphene.types import Field, List
 
+from .aggregates import (
+    COUNT_FIELD,
+    compute_aggregates,
+    get_aggregates_connection,
+    has_aggregates,
+)
+from .annotations import annotate_queryset
+from .compat import Window
+from .counting import (
+    COUNT_CAPPED,
+    COUNT_ESTIMATED,
+    COUNT_EXACT,
+    COUNT_STRATEGIES,
+    COUNT_WINDOW,
+    WINDOW_COUNT_ANNOTATION,
+    can_reverse,
+    count_queryset,
+    supports_window_count,
+)
+from .identity_map import get_identity_map
+from .json_pushdown import get_json_queryset
+from .prefetch import is_prefetched
 from .settings import graphene_settings
 from .utils import maybe_queryset
+from .values import get_values_queryset
+
+
+# Options of DjangoListField bound to `list_resolver` as the `list_options`
+# keyword, after the positional arguments
+ListOptions = namedtuple("ListOptions", ["use_values", "json_pushdown"])
+DEFAULT_LIST_OPTIONS = ListOptions(use_values=False, json_pushdown=False)
+
+# Options of DjangoConnectionField bound to `connection_resolver` as the
+# `connection_options` keyword, after the positional arguments
+ConnectionOptions = namedtuple(
+    "ConnectionOptions", ["count_strategy", "count_cap", "use_values", "json_pushdown"]
+)
+DEFAULT_CONNECTION_OPTIONS = ConnectionOptions(
+    count_strategy=COUNT_EXACT, count_cap=None, use_values=False, json_pushdown=False
+)
 
 
 class DjangoListField(Field):
     def __init__(self, _type, *args, **kwargs):
         from .types import DjangoObjectType
 
+        self.use_values = kwargs.pop("use_values", False)
+        self.json_pushdown = kwargs.pop("json_pushdown", False)
+
         if isinstance(_type, NonNull):
             _type = _type.of_type
 
@@ -50,14 +93,33 @@ class DjangoListField(Field):
     def list_resolver(
         django_object_type, resolver, default_manager, root, info, **args
     ):
+        options = args.pop("list_options", DEFAULT_LIST_OPTIONS)
         queryset = maybe_queryset(resolver(root, info, **args))
         if queryset is None:
             queryset = maybe_queryset(default_manager)
 
-        if isinstance(queryset, QuerySet):
+        prefetched = None
+        if is_prefetched(queryset):
+            prefetched = django_object_type.resolve_prefetched(queryset, info)
+        if prefetched is not None:
+            queryset = prefetched
+        elif isinstance(queryset, QuerySet):
             # Pass queryset to the DjangoObjectType get_queryset method
             queryset = maybe_queryset(django_object_type.get_queryset(queryset, info))
-
+            queryset = annotate_queryset(queryset, django_object_type, info)
+
+        if options.json_pushdown:
+            json_queryset = get_json_queryset(queryset, django_object_type, info)
+            if json_queryset is not queryset:
+                return json_queryset
+        if options.use_values:
+            values_queryset = get_values_queryset(queryset, django_object_type, info)
+            if values_queryset is not queryset:
+                return values_queryset
+
+        identity_map = get_identity_map(info, django_object_type)
+        if identity_map is not None and queryset is not None:
+            return identity_map.add_all(queryset)
         return queryset
 
     def get_resolver(self, parent_resolver):
@@ -66,13 +128,21 @@ class DjangoListField(Field):
             _type = _type.of_type
         django_object_type = _type.of_type.of_type
         return partial(
-            self.list_resolver, django_object_type, parent_resolver, self.get_manager(),
+            self.list_resolver,
+            django_object_type,
+            parent_resolver,
+            self.get_manager(),
+            list_options=ListOptions(
+                use_values=self.use_values, json_pushdown=self.json_pushdown
+            ),
         )
 
 
 class DjangoConnectionField(ConnectionField):
     def __init__(self, *args, **kwargs):
         self.on = kwargs.pop("on", False)
+        self.aggregates = kwargs.pop("aggregates", None)
+        self.aggregates_name = kwargs.pop("aggregates_name", None)
         self.max_limit = kwargs.pop(
             "max_limit", graphene_settings.RELAY_CONNECTION_MAX_LIMIT
         )
@@ -80,6 +150,17 @@ class DjangoConnectionField(ConnectionField):
             "enforce_first_or_last",
             graphene_settings.RELAY_CONNECTION_ENFORCE_FIRST_OR_LAST,
         )
+        self.count_strategy = kwargs.pop(
+            "count_strategy", graphene_settings.RELAY_CONNECTION_COUNT_STRATEGY
+        )
+        self.count_cap = kwargs.pop(
+            "count_cap", graphene_settings.RELAY_CONNECTION_COUNT_CAP
+        )
+        self.use_values = kwargs.pop("use_values", False)
+        self.json_pushdown = kwargs.pop("json_pushdown", False)
+        assert (
+            self.count_strategy in COUNT_STRATEGIES
+        ), 'Unknown count strategy "{}"'.format(self.count_strategy)
         kwargs.setdefault("offset", Int())
         super(DjangoConnectionField, self).__init__(*args, **kwargs)
 
@@ -99,6 +180,10 @@ class DjangoConnectionField(ConnectionField):
             _type.__name__
         )
         connection_type = _type._meta.connection
+        if self.aggregates:
+            connection_type = get_aggregates_connection(
+                connection_type, self.aggregates, self.aggregates_name
+            )
         if non_null:
             return NonNull(connection_type)
         return connection_type
@@ -127,10 +212,25 @@ class DjangoConnectionField(ConnectionField):
     @classmethod
     def resolve_queryset(cls, connection, queryset, info, args):
         # queryset is the resolved iterable from ObjectType
+        prefetched = maybe_queryset(queryset)
+        # Aggregates are computed by the database
+        if is_prefetched(prefetched) and not has_aggregates(connection):
+            objects = connection._meta.node.resolve_prefetched(prefetched, info)
+            if objects is not None:
+                return objects
         return connection._meta.node.get_queryset(queryset, info)
 
     @classmethod
-    def resolve_connection(cls, connection, args, iterable, max_limit=None):
+    def resolve_connection(
+        cls,
+        connection,
+        args,
+        iterable,
+        max_limit=None,
+        count_strategy=COUNT_EXACT,
+        count_cap=None,
+        aggregated=None,
+    ):
         # Remove the offset parameter and convert it to an after cursor.
         offset = args.pop("offset", None)
         after = args.get("after")
@@ -142,7 +242,31 @@ class DjangoConnectionField(ConnectionField):
 
         iterable = maybe_queryset(iterable)
 
-        if isinstance(iterable, QuerySet):
+        forward = (
+            # Otherwise the items were counted along with the aggregates
+            aggregated is None
+            and isinstance(iterable, QuerySet)
+            and "last" not in args
+            and "before" not in args
+        )
+        if (
+            forward
+            and count_strategy == COUNT_WINDOW
+            and supports_window_count(iterable)
+        ):
+            window_connection = cls.resolve_connection_window(
+                connection, args, iterable, max_limit
+            )
+            if window_connection is not None:
+                return window_connection
+        elif forward and count_strategy in (COUNT_ESTIMATED, COUNT_CAPPED):
+            return cls.resolve_connection_page(
+                connection, args, iterable, max_limit, count_strategy, count_cap
+            )
+
+        if aggregated is not None:
+            list_length = aggregated[COUNT_FIELD]
+        elif isinstance(iterable, QuerySet):
             list_length = iterable.count()
         else:
             list_length = len(iterable)
@@ -155,6 +279,13 @@ class DjangoConnectionField(ConnectionField):
         # AssertionError
         after = min(get_offset_with_default(args.get("after"), -1) + 1, list_length)
 
+        from_end = (
+            "last" in args
+            and "first" not in args
+            and isinstance(iterable, QuerySet)
+            and can_reverse(iterable)
+        )
+
         if max_limit is not None and "first" not in args:
             if "last" in args:
                 args["first"] = list_length
@@ -162,10 +293,18 @@ class DjangoConnectionField(ConnectionField):
             else:
                 args["first"] = max_limit
 
+        if from_end:
+            slice_start, list_slice = cls.get_last_items(
+                iterable, args, after, list_length
+            )
+            list_slice_length = len(list_slice)
+        else:
+            slice_start, list_slice = after, iterable[after:]
+
         connection = connection_from_list_slice(
-            iterable[after:],
+            list_slice,
             args,
-            slice_start=after,
+            slice_start=slice_start,
             list_length=list_length,
             list_slice_length=list_slice_length,
             connection_type=connection,
@@ -174,6 +313,107 @@ class DjangoConnectionField(ConnectionField):
         )
         connection.iterable = iterable
         connection.length = list_length
+        connection.length_is_exact = True
+        connection.aggregated = aggregated
+        return connection
+
+    @classmethod
+    def get_last_items(cls, queryset, args, after, list_length):
+        """
+        Fetch the `last` items before the `before` cursor by reversing the
+        ordering of `queryset`, so that the database only skips the items
+        after them rather than all the items before them. Return the offset
+        of the first item and the items in the original order.
+        """
+        end = min(get_offset_with_default(args.get("before"), list_length), list_length)
+        start = max(after, end - args["last"])
+        if end <= start:
+            return start, []
+        items = list(queryset.reverse()[list_length - end : list_length - start])
+        items.reverse()
+        return start, items
+
+    @classmethod
+    def resolve_connection_window(cls, connection, args, queryset, max_limit):
+        """
+        Fetch the page of `queryset` with its total count annotated on each
+        item by a window function, in a single query. Return None when the
+        page is empty, as the count is then unknown.
+        """
+        after = get_offset_with_default(args.get("after"), -1) + 1
+        first = args.get("first")
+        if max_limit is not None and first is None:
+            args["first"] = first = max_limit
+
+        counted = queryset.annotate(
+            **{WINDOW_COUNT_ANNOTATION: Window(expression=Count("*"))}
+        )
+        if first is None:
+            page = list(counted[after:])
+        else:
+            page = list(counted[after : after + first])
+        if not page:
+            return None
+
+        list_length = getattr(page[0], WINDOW_COUNT_ANNOTATION)
+        connection = connection_from_list_slice(
+            page,
+            args,
+            slice_start=after,
+            list_length=list_length,
+            list_slice_length=len(page),
+            connection_type=connection,
+            edge_type=connection.Edge,
+            pageinfo_type=PageInfo,
+        )
+        connection.iterable = queryset
+        connection.length = list_length
+        connection.length_is_exact = True
+        return connection
+
+    @classmethod
+    def resolve_connection_page(
+        cls, connection, args, queryset, max_limit, count_strategy, count_cap
+    ):
+        """
+        Resolve the connection without counting the items of `queryset`
+        beforehand: one more item than requested tells whether there is a
+        next page, and the length is only counted following `count_strategy`
+        when the page isn't the last one.
+        """
+        after = get_offset_with_default(args.get("after"), -1) + 1
+        first = args.get("first")
+        if max_limit is not None and first is None:
+            args["first"] = first = max_limit
+
+        if first is None:
+            page = list(queryset[after:])
+        else:
+            page = list(queryset[after : after + first + 1])
+        list_length = after + len(page)
+
+        connection = connection_from_list_slice(
+            page,
+            args,
+            slice_start=after,
+            list_length=list_length,
+            list_slice_length=len(page),
+            connection_type=connection,
+            edge_type=connection.Edge,
+            pageinfo_type=PageInfo,
+        )
+        connection.iterable = queryset
+
+        if (page or not after) and (first is None or len(page) <= first):
+            # The items end in this page
+            connection.length, connection.length_is_exact = list_length, True
+        else:
+            length, length_is_exact = count_queryset(
+                queryset, count_strategy, count_cap
+            )
+            # Estimates can be stale and caps below the items paged through
+            connection.length = max(length, list_length)
+            connection.length_is_exact = length_is_exact
         return connection
 
     @classmethod
@@ -189,6 +429,7 @@ class DjangoConnectionField(ConnectionField):
         info,
         **args
     ):
+        options = args.pop("connection_options", DEFAULT_CONNECTION_OPTIONS)
         first = args.get("first")
         last = args.get("last")
         offset = args.get("offset")
@@ -225,9 +466,41 @@ class DjangoConnectionField(ConnectionField):
         # thus the iterable gets refiltered by resolve_queryset
         # but iterable might be promise
         iterable = queryset_resolver(connection, iterable, info, args)
-        on_resolve = partial(
-            cls.resolve_connection, connection, args, max_limit=max_limit
+        resolve_connection = partial(
+            cls.resolve_connection,
+            connection,
+            args,
+            max_limit=max_limit,
+            count_strategy=options.count_strategy,
+            count_cap=options.count_cap,
         )
+        identity_map = get_identity_map(info, connection._meta.node)
+
+        def on_resolve(iterable):
+            iterable = maybe_queryset(iterable)
+            resolve = partial(
+                resolve_connection,
+                aggregated=compute_aggregates(connection, iterable, info),
+            )
+            node_path = ("edges", "node")
+            iterable = annotate_queryset(
+                iterable, connection._meta.node, info, node_path
+            )
+            if options.json_pushdown:
+                json_iterable = get_json_queryset(
+                    iterable, connection._meta.node, info, node_path
+                )
+                if json_iterable is not iterable:
+                    return resolve(json_iterable)
+            if options.use_values:
+                iterable = get_values_queryset(
+                    iterable, connection._meta.node, info, node_path
+                )
+            resolved = resolve(iterable)
+            if identity_map is not None:
+                for edge in resolved.edges:
+                    edge.node = identity_map.add(edge.node)
+            return resolved
 
         if Promise.is_thenable(iterable):
             return Promise.resolve(iterable).then(on_resolve)
@@ -243,7 +516,66 @@ class DjangoConnectionField(ConnectionField):
             self.get_queryset_resolver(),
             self.max_limit,
             self.enforce_first_or_last,
+            connection_options=ConnectionOptions(
+                count_strategy=self.count_strategy,
+                count_cap=self.count_cap,
+                use_values=self.use_values,
+                json_pushdown=self.json_pushdown,
+            ),
         )
 
     def get_queryset_resolver(self):
         return self.resolve_queryset
+
+
+class DjangoNodesField(Field):
+    """
+    Field resolving a list of Relay global IDs to their nodes, in the same
+    order and with null for the missing ones. The nodes of each
+    DjangoObjectType are fetched with a single query.
+    """
+
+    def __init__(self, node=Node, **kwargs):
+        assert issubclass(node, Node), "DjangoNodesField can only operate in Nodes"
+        self.node_type = node
+        kwargs.setdefault(
+            "ids", NonNull(List(NonNull(ID)), description="The IDs of the objects"),
+        )
+        super(DjangoNodesField, self).__init__(List(node), **kwargs)
+
+    @staticmethod
+    def nodes_resolver(node, root, info, ids):
+        from .types import DjangoObjectType
+
+        ids_by_type = OrderedDict()
+        for index, global_id in enumerate(ids):
+            try:
+                _type, _id = node.from_global_id(global_id)
+                graphene_type = info.schema.get_type(_type).graphene_type
+            except Exception:
+                continue
+            # We make sure the ObjectType implements the node interface
+            if node in graphene_type._meta.interfaces:
+                ids_by_type.setdefault(graphene_type, []).append((index, _id))
+
+        nodes = [None] * len(ids)
+        for graphene_type, indexed_ids in ids_by_type.items():
+            type_ids = [_id for _, _id in indexed_ids]
+            get_node = getattr(graphene_type, "get_node", None)
+            if issubclass(graphene_type, DjangoObjectType) and (
+                # A custom get_node is only honored one node at a time
+                get_node.__func__ is DjangoObjectType.get_node.__func__
+                or graphene_type.get_nodes.__func__
+                is not DjangoObjectType.get_nodes.__func__
+            ):
+                type_nodes = graphene_type.get_nodes(info, type_ids)
+            elif get_node:
+                type_nodes = [get_node(info, _id) for _id in type_ids]
+            else:
+                continue
+            for (index, _), type_node in zip(indexed_ids, type_nodes):
+                nodes[index] = type_node
+        return nodes
+
+    def get_resolver(self, parent_resolver):
+        return partial(self.nodes_resolver, self.node_type)
@@ -15,6 +15,7 @@ else:
         GlobalIDMultipleChoiceFilter,
         ListFilter,
         RangeFilter,
+        SearchFilter,
         TypedFilter,
     )
 
@@ -25,5 +26,6 @@ else:
         "ArrayFilter",
         "ListFilter",
         "RangeFilter",
+        "SearchFilter",
         "TypedFilter",
     ]
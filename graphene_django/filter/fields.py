@@ -2,9 +2,13 @@ from collections import OrderedDict
 from functools import partial
 
 from django.core.exceptions import ValidationError
+from django.db.models.query import QuerySet
 from graphene.types.argument import to_arguments
 from graphene.utils.str_converters import to_snake_case
 from ..fields import DjangoConnectionField
+from ..prefetch import is_prefetched
+from ..utils import maybe_queryset
+from .filterset import get_filterset_fast_path
 from .utils import get_filtering_args_from_filterset, get_filterset_class
 
 
@@ -46,7 +50,9 @@ class DjangoFilterConnectionField(DjangoConnectionField):
             filterset_class = (
                 self._provided_filterset_class or self.node_type._meta.filterset_class
             )
-            self._filterset_class = get_filterset_class(filterset_class, **meta)
+            self._filterset_class = get_filterset_class(
+                filterset_class, registry=self.node_type._meta.registry, **meta
+            )
 
         return self._filterset_class
 
@@ -75,9 +81,18 @@ class DjangoFilterConnectionField(DjangoConnectionField):
             connection, iterable, info, args
         )
 
-        filterset = filterset_class(
-            data=filter_kwargs(), queryset=qs, request=info.context
-        )
+        data = filter_kwargs()
+        fast_path = get_filterset_fast_path(filterset_class)
+        if fast_path is not None and fast_path.can_filter(data) and not data:
+            # Without arguments the filters would all be no-ops
+            return qs
+        if not isinstance(qs, QuerySet) and is_prefetched(maybe_queryset(iterable)):
+            # The filterset can't be applied to the prefetched objects
+            qs = connection._meta.node.get_queryset(iterable, info)
+        if fast_path is not None and fast_path.can_filter(data):
+            return fast_path.filter_queryset(qs, data)
+
+        filterset = filterset_class(data=data, queryset=qs, request=info.context)
         if filterset.form.is_valid():
             return filterset.qs
         raise ValidationError(filterset.form.errors.as_json())
@@ -12,6 +12,7 @@ else:
     from .global_id_filter import GlobalIDFilter, GlobalIDMultipleChoiceFilter
     from .list_filter import ListFilter
     from .range_filter import RangeFilter
+    from .search_filter import SearchFilter
     from .typed_filter import TypedFilter
 
     __all__ = [
@@ -21,5 +22,6 @@ else:
         "ArrayFilter",
         "ListFilter",
         "RangeFilter",
+        "SearchFilter",
         "TypedFilter",
     ]
@@ -1,8 +1,13 @@
+from django.core.exceptions import ValidationError
 from django_filters import Filter, MultipleChoiceFilter
+from django_filters.utils import get_model_field
 
 from graphql_relay.node.node import from_global_id
 
 from ...forms import GlobalIDFormField, GlobalIDMultipleChoiceField
+from ...registry import get_global_registry
+from ...utils import from_global_ids
+from ..lookups import ArrayInLookupMixin
 
 
 class GlobalIDFilter(Filter):
@@ -20,9 +25,64 @@ class GlobalIDFilter(Filter):
         return super(GlobalIDFilter, self).filter(qs, _id)
 
 
-class GlobalIDMultipleChoiceFilter(MultipleChoiceFilter):
+class GlobalIDMultipleChoiceFilter(ArrayInLookupMixin, MultipleChoiceFilter):
+    """
+    Filter for a list of Relay global IDs. Their type names are looked up in
+    `registry`, set to the registry of the node by DjangoFilterConnectionField
+    (defaults to the global registry).
+    """
+
     field_class = GlobalIDMultipleChoiceField
 
+    def __init__(self, *args, **kwargs):
+        self.registry = kwargs.pop("registry", None)
+        super(GlobalIDMultipleChoiceFilter, self).__init__(*args, **kwargs)
+
     def filter(self, qs, value):
-        gids = [from_global_id(v)[1] for v in value]
-        return super(GlobalIDMultipleChoiceFilter, self).filter(qs, gids)
+        if not value:
+            return qs
+
+        pairs = from_global_ids(value)
+        model_field = get_model_field(qs.model, self.field_name)
+        if model_field is None or self.conjoined or self.lookup_expr != "exact":
+            return super(GlobalIDMultipleChoiceFilter, self).filter(
+                qs, [_id for _, _id in pairs]
+            )
+
+        if model_field.is_relation:
+            model = model_field.related_model
+            pk_field = model._meta.pk
+            field_name = "%s__pk" % self.field_name
+        else:
+            model = model_field.model
+            pk_field = model_field
+            field_name = self.field_name
+
+        self.validate_type_names(model, value, pairs)
+        pks = list(set(pk_field.to_python(_id) for _, _id in pairs))
+
+        # A single lookup, same as the OR of the `exact` predicates built by
+        # MultipleChoiceFilter
+        lookup = self.get_array_lookup(qs, pks) or "%s__in" % field_name
+        qs = self.get_method(qs)(**{lookup: pks})
+        return qs.distinct() if self.distinct else qs
+
+    def validate_type_names(self, model, global_ids, pairs):
+        """
+        Reject the IDs of the types registered for another model than `model`.
+        """
+        registry = self.registry or get_global_registry()
+        valid_types = {}
+        for global_id, (_type, _) in zip(global_ids, pairs):
+            valid = valid_types.get(_type)
+            if valid is None:
+                type_model = registry.get_model_for_type_name(_type)
+                valid = valid_types[_type] = type_model is None or (
+                    issubclass(type_model, model) or issubclass(model, type_model)
+                )
+            if not valid:
+                raise ValidationError(
+                    self.field.error_messages["invalid_choice"],
+                    code="invalid_choice",
+                    params={"value": global_id},
+                )
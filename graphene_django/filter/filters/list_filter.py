@@ -1,7 +1,8 @@
+from ..lookups import ArrayInLookupMixin
 from .typed_filter import TypedFilter
 
 
-class ListFilter(TypedFilter):
+class ListFilter(ArrayInLookupMixin, TypedFilter):
     """
     Filter that takes a list of value as input.
     It is for example used for `__in` filters.
@@ -22,5 +23,15 @@ class ListFilter(TypedFilter):
                 return qs
             else:
                 return qs.none()
-        else:
-            return super(ListFilter, self).filter(qs, value)
+
+        array_lookup = (
+            value is not None
+            and self.lookup_expr == "in"
+            and self.get_array_lookup(qs, value)
+        )
+        if array_lookup:
+            if self.distinct:
+                qs = qs.distinct()
+            return self.get_method(qs)(**{array_lookup: value})
+
+        return super(ListFilter, self).filter(qs, value)
@@ -0,0 +1,143 @@
+from functools import reduce
+
+import django
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django_filters.constants import EMPTY_VALUES
+
+import graphene
+
+from .typed_filter import TypedFilter
+
+
+class SearchFilter(TypedFilter):
+    """
+    Full-text search filter.
+
+    On PostgreSQL it matches a `SearchQuery` against `vector_field` (a
+    `SearchVectorField`, ideally with a GIN index) or against a
+    `SearchVector` of `search_fields`. With `trigram=True` it matches on the
+    trigram similarity of `search_fields` instead (needs the `pg_trgm`
+    extension). Other databases fall back to `icontains` on `search_fields`.
+
+    The rank of each result is annotated as `rank_field` and, unless
+    `order_by_rank` is False or the queryset is already explicitly ordered,
+    results are ordered by decreasing rank.
+    """
+
+    def __init__(
+        self,
+        search_fields=None,
+        vector_field=None,
+        config=None,
+        search_type="plain",
+        trigram=False,
+        trigram_threshold=0.3,
+        rank_field=None,
+        order_by_rank=True,
+        *args,
+        **kwargs
+    ):
+        if not (search_fields or vector_field):
+            raise ImproperlyConfigured(
+                "SearchFilter needs search_fields or a vector_field."
+            )
+        if trigram and not search_fields:
+            raise ImproperlyConfigured("Trigram search needs search_fields.")
+        if search_type != "plain" and django.VERSION < (2, 2):
+            raise ImproperlyConfigured(
+                "The {} search type needs Django 2.2 or later.".format(search_type)
+            )
+        kwargs.setdefault("input_type", graphene.String)
+        super(SearchFilter, self).__init__(*args, **kwargs)
+        self.search_fields = list(search_fields or [])
+        self.vector_field = vector_field
+        self.config = config
+        self.search_type = search_type
+        self.trigram = trigram
+        self.trigram_threshold = trigram_threshold
+        self._rank_field = rank_field
+        self.order_by_rank = order_by_rank
+
+    @property
+    def rank_field(self):
+        return self._rank_field or "%s_rank" % self.field_name
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+
+        if self.distinct:
+            qs = qs.distinct()
+
+        vendor = connections[qs.db].vendor
+        if vendor == "postgresql" and self.trigram:
+            qs = self.filter_trigram(qs, value)
+        elif vendor == "postgresql":
+            qs = self.filter_search_query(qs, value)
+        else:
+            qs = self.filter_icontains(qs, value, vendor)
+
+        if self.order_by_rank and not qs.query.order_by:
+            # The primary key keeps the order stable for pagination
+            qs = qs.order_by(F(self.rank_field).desc(), "pk")
+        return qs
+
+    def filter_search_query(self, qs, value):
+        from django.contrib.postgres.search import (
+            SearchQuery,
+            SearchRank,
+            SearchVector,
+        )
+
+        search_kwargs = {"config": self.config}
+        if self.search_type != "plain":
+            # Added in Django 2.2
+            search_kwargs["search_type"] = self.search_type
+        query = SearchQuery(value, **search_kwargs)
+        vector_field = self.vector_field
+        if not vector_field:
+            vector_field = "%s_vector" % self.field_name
+            qs = qs.annotate(
+                **{vector_field: SearchVector(*self.search_fields, config=self.config)}
+            )
+        return qs.annotate(
+            **{self.rank_field: SearchRank(F(vector_field), query)}
+        ).filter(**{vector_field: query})
+
+    def filter_trigram(self, qs, value):
+        from django.contrib.postgres.search import TrigramSimilarity
+        from django.db.models.functions import Greatest
+
+        similarities = [TrigramSimilarity(field, value) for field in self.search_fields]
+        similarity = (
+            Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+        )
+        return qs.annotate(**{self.rank_field: similarity}).filter(
+            **{"%s__gt" % self.rank_field: self.trigram_threshold}
+        )
+
+    def filter_icontains(self, qs, value, vendor):
+        if not self.search_fields:
+            raise ImproperlyConfigured(
+                "SearchFilter needs search_fields to search on {}.".format(vendor)
+            )
+        matches = [
+            Q(**{"%s__icontains" % field: value}) for field in self.search_fields
+        ]
+        # The rank is the number of fields containing the value
+        rank = reduce(
+            lambda rank, match: rank + match,
+            [
+                Case(
+                    When(match, then=Value(1)),
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+                for match in matches
+            ],
+        )
+        return qs.annotate(**{self.rank_field: rank}).filter(
+            reduce(lambda q, match: q | match, matches)
+        )
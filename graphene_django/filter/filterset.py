@@ -1,7 +1,13 @@
 import itertools
+from collections import OrderedDict
 
+from django import forms
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.forms.utils import ErrorDict, ErrorList
 from django_filters import VERSION
+from django_filters.constants import EMPTY_VALUES
+from django_filters.filters import Filter, QuerySetRequestMixin
 from django_filters.filterset import BaseFilterSet, FilterSet
 from django_filters.filterset import FILTER_FOR_DBFIELD_DEFAULTS
 
@@ -80,3 +86,194 @@ def custom_filterset_factory(model, filterset_base_class=FilterSet, **meta):
         {"Meta": meta_class},
     )
     return filterset
+
+
+# Filter classes whose `filter` method comes from one of these modules are
+# known to be a no-op when they receive an empty value.
+STANDARD_FILTER_MODULES = ("django_filters.filters", "graphene_django.filter.filters")
+
+# BaseFilterSet members that must not be overridden for a FilterSet class to
+# be applied without instantiating it and its form.
+FILTERSET_INTERNALS = (
+    "__init__",
+    "is_valid",
+    "errors",
+    "filter_queryset",
+    "qs",
+    "get_form_class",
+    "form",
+)
+
+
+def _get_defining_class(cls, name):
+    for klass in cls.__mro__:
+        if name in klass.__dict__:
+            return klass
+    return None
+
+
+def _is_standard_filter(filter_field):
+    filter_module = getattr(type(filter_field).filter, "__module__", None) or ""
+    return (
+        filter_module.startswith(STANDARD_FILTER_MODULES)
+        and not filter_field.extra.get("required", False)
+        # Their form field depends on the request of the FilterSet
+        and not isinstance(filter_field, QuerySetRequestMixin)
+    )
+
+
+class FilterSetFastPath(object):
+    """
+    Apply the filters of a plain FilterSet class without instantiating the
+    FilterSet, its form class and its bound form on every request.
+
+    Only the supplied arguments are cleaned and filtered on, following a
+    FilterPlan compiled once per combination of argument names. Filters with
+    a `method` need a FilterSet instance so they are not handled here.
+    """
+
+    # Bound on the number of argument combinations compiled per FilterSet
+    max_plans = 64
+
+    def __init__(self, filterset_class):
+        self.filterset_class = filterset_class
+        self._plans = OrderedDict()
+        self.filters = OrderedDict(
+            (name, filter_field)
+            for name, filter_field in filterset_class.base_filters.items()
+            if not filter_field.method
+        )
+
+    @classmethod
+    def for_filterset_class(cls, filterset_class):
+        """
+        Return a FilterSetFastPath for `filterset_class`, or None if the
+        FilterSet or one of its filters is customized in a way that needs the
+        regular FilterSet machinery.
+        """
+        if filterset_class._meta.form is not forms.Form:
+            return None
+        for name in FILTERSET_INTERNALS:
+            if _get_defining_class(filterset_class, name) is not BaseFilterSet:
+                return None
+        if not all(
+            _is_standard_filter(filter_field)
+            for filter_field in filterset_class.base_filters.values()
+        ):
+            return None
+        return cls(filterset_class)
+
+    def can_filter(self, data):
+        return all(name in self.filters for name in data)
+
+    def get_plan(self, data):
+        """
+        Return the FilterPlan for the names of the arguments in `data`,
+        compiling it the first time this combination of arguments is seen.
+        """
+        key = frozenset(data)
+        plan = self._plans.get(key)
+        if plan is None:
+            while len(self._plans) >= self.max_plans:
+                self._plans.popitem(last=False)
+            plan = self._plans[key] = FilterPlan(
+                self.filterset_class,
+                [
+                    (name, filter_field)
+                    for name, filter_field in self.filters.items()
+                    if name in key
+                ],
+            )
+        return plan
+
+    def filter_queryset(self, queryset, data):
+        return self.get_plan(data).filter_queryset(queryset, data)
+
+
+class FilterPlan(object):
+    """
+    The compiled steps applying a given combination of filters: for each one
+    the callable cleaning its argument like the FilterSet form would, and the
+    callable filtering the queryset on the cleaned value.
+
+    Steps are kept in the order of the FilterSet filters, which is the order
+    django-filter applies them in.
+    """
+
+    def __init__(self, filterset_class, filters):
+        self.filterset_class = filterset_class
+        self.steps = [
+            (name, self.get_cleaner(name, filter_field), self.get_filter(filter_field))
+            for name, filter_field in filters
+        ]
+
+    @staticmethod
+    def get_cleaner(name, filter_field):
+        field = filter_field.field
+        value_from_datadict = field.widget.value_from_datadict
+        clean = field.clean
+
+        def cleaner(data):
+            return clean(value_from_datadict(data, None, name))
+
+        return cleaner
+
+    @staticmethod
+    def get_filter(filter_field):
+        if type(filter_field).filter is not Filter.filter:
+            return filter_field.filter
+
+        # Inline `Filter.filter` as a direct ORM lookup
+        lookup = "%s__%s" % (filter_field.field_name, filter_field.lookup_expr)
+        exclude = filter_field.exclude
+        distinct = filter_field.distinct
+
+        def lookup_filter(queryset, value):
+            if value in EMPTY_VALUES:
+                return queryset
+            if distinct:
+                queryset = queryset.distinct()
+            if exclude:
+                return queryset.exclude(**{lookup: value})
+            return queryset.filter(**{lookup: value})
+
+        return lookup_filter
+
+    def clean(self, data):
+        """
+        Clean `data` like the FilterSet form would, raising a ValidationError
+        with the same content as the form errors.
+        """
+        cleaned_data = []
+        errors = ErrorDict()
+        for name, cleaner, filter_ in self.steps:
+            try:
+                cleaned_data.append((name, filter_, cleaner(data)))
+            except ValidationError as e:
+                errors[name] = ErrorList(e.error_list)
+        if errors:
+            raise ValidationError(errors.as_json())
+        return cleaned_data
+
+    def filter_queryset(self, queryset, data):
+        for name, filter_, value in self.clean(data):
+            queryset = filter_(queryset, value)
+            assert isinstance(queryset, models.QuerySet), (
+                "Expected '%s.%s' to return a QuerySet, but got a %s instead."
+                % (self.filterset_class.__name__, name, type(queryset).__name__)
+            )
+        return queryset
+
+
+_filterset_fast_paths = {}
+
+
+def get_filterset_fast_path(filterset_class):
+    """ Memoized FilterSetFastPath.for_filterset_class
+    """
+    try:
+        return _filterset_fast_paths[filterset_class]
+    except KeyError:
+        fast_path = FilterSetFastPath.for_filterset_class(filterset_class)
+        _filterset_fast_paths[filterset_class] = fast_path
+        return fast_path
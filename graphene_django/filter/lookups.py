@@ -0,0 +1,115 @@
+import json
+import re
+
+import six
+from django.core.exceptions import EmptyResultSet
+from django.db.models import Field
+from django.db.models.lookups import In
+from django.utils.datastructures import OrderedSet
+from django_filters.utils import get_model_field
+
+from ..settings import graphene_settings
+
+# Length modifiers would make PostgreSQL truncate the values cast to the array
+# type (`varchar(30)[]`), which could produce false matches.
+TYPE_MODIFIERS_RE = re.compile(r"\(.*\)")
+
+
+@Field.register_lookup
+class ArrayIn(In):
+    """
+    `in` lookup which passes its values as a single parameter rather than one
+    parameter per value, so the SQL statement has the same text whatever the
+    number of values:
+
+    - on PostgreSQL: `column = ANY(%s::type[])`
+    - on SQLite: `column IN (SELECT value FROM json_each(%s))`
+
+    It falls back to the regular `in` lookup on other databases, when the
+    right hand side is a subquery, or when SQLite can't handle the values.
+    """
+
+    lookup_name = "graphene_array_in"
+
+    def as_sql(self, compiler, connection):
+        if not self.rhs_is_direct_value() or connection.vendor not in (
+            "postgresql",
+            "sqlite",
+        ):
+            return super(ArrayIn, self).as_sql(compiler, connection)
+
+        # Like `In.process_rhs`, NULL never matches and duplicates are dropped
+        try:
+            rhs = OrderedSet(value for value in self.rhs if value is not None)
+        except TypeError:  # Unhashable items in self.rhs
+            rhs = [value for value in self.rhs if value is not None]
+        if not rhs:
+            raise EmptyResultSet
+
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        _, rhs_params = self.batch_process_rhs(compiler, connection, rhs)
+        rhs_params = list(rhs_params)
+
+        if connection.vendor == "postgresql":
+            array_type = TYPE_MODIFIERS_RE.sub(
+                "", self.lhs.output_field.rel_db_type(connection)
+            )
+            return (
+                "%s = ANY(%%s::%s[])" % (lhs, array_type),
+                list(lhs_params) + [rhs_params],
+            )
+
+        if supports_json_each(connection) and all(
+            isinstance(param, six.integer_types + six.string_types)
+            for param in rhs_params
+        ):
+            return (
+                "%s IN (SELECT value FROM json_each(%%s))" % lhs,
+                list(lhs_params) + [json.dumps(rhs_params)],
+            )
+
+        return super(ArrayIn, self).as_sql(compiler, connection)
+
+
+def supports_json_each(connection):
+    supports_json_field = getattr(connection.features, "supports_json_field", None)
+    if supports_json_field is not None:
+        return supports_json_field
+    # The JSON1 extension is built into SQLite since 3.38
+    return connection.Database.sqlite_version_info >= (3, 38)
+
+
+class ArrayInLookupMixin(object):
+    """
+    Filter mixin switching to the `ArrayIn` lookup when filtering on more
+    values than `array_threshold` (defaults to the `FILTER_ARRAY_IN_THRESHOLD`
+    setting, None disables it).
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.array_threshold = kwargs.pop("array_threshold", None)
+        super(ArrayInLookupMixin, self).__init__(*args, **kwargs)
+
+    def get_array_threshold(self):
+        if self.array_threshold is not None:
+            return self.array_threshold
+        return graphene_settings.FILTER_ARRAY_IN_THRESHOLD
+
+    def get_array_lookup(self, qs, values):
+        """
+        Return the `ArrayIn` lookup path to use for `values`, or None if the
+        regular lookups should be used.
+        """
+        threshold = self.get_array_threshold()
+        if threshold is None or len(values) <= threshold:
+            return None
+
+        model_field = get_model_field(qs.model, self.field_name)
+        if model_field is None:
+            return None
+
+        field_name = self.field_name
+        if model_field.is_relation:
+            # Compare the primary keys of the related objects
+            field_name = "%s__pk" % field_name
+        return "%s__%s" % (field_name, ArrayIn.lookup_name)
@@ -2,6 +2,7 @@ from datetime import datetime
 from textwrap import dedent
 
 import pytest
+from mock import patch
 from django.db.models import TextField, Value
 from django.db.models.functions import Concat
 
@@ -222,6 +223,40 @@ def test_filter_filterset_information_on_meta_related():
     assert_not_orderable(articles_field)
 
 
+def test_filter_filterset_and_arguments_are_shared_per_type():
+    class ReporterFilterNode(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            filter_fields = ["first_name"]
+
+    class ArticleFilterNode(DjangoObjectType):
+        class Meta:
+            model = Article
+            interfaces = (Node,)
+            filter_fields = ["headline", "reporter"]
+
+    class Query(ObjectType):
+        all_articles = DjangoFilterConnectionField(ArticleFilterNode)
+        other_articles = DjangoFilterConnectionField(ArticleFilterNode)
+        headline_articles = DjangoFilterConnectionField(
+            ArticleFilterNode, fields=["headline"]
+        )
+        reporter = Field(ReporterFilterNode)
+
+    schema = Schema(query=Query)
+    fields = Query._meta.fields
+    all_articles = fields["all_articles"]
+    articles_field = ReporterFilterNode._meta.fields["articles"].get_type()
+
+    for field in [fields["other_articles"], articles_field]:
+        assert field.filterset_class is all_articles.filterset_class
+        assert field.filtering_args is all_articles.filtering_args
+    assert (
+        fields["headline_articles"].filterset_class is not all_articles.filterset_class
+    )
+
+
 def test_filter_filterset_class_filter_fields_exception():
     with pytest.raises(Exception):
 
@@ -1235,3 +1270,107 @@ def test_only_custom_filters():
 
     field = DjangoFilterConnectionField(ReporterFilterNode)
     assert_arguments(field, "some_filter")
+
+
+def test_filterset_is_not_instantiated_without_filter_arguments():
+    class Query(ObjectType):
+        all_reporters = DjangoFilterConnectionField(
+            ReporterNode, fields=["first_name", "articles"]
+        )
+
+    Reporter.objects.create(first_name="r1", last_name="r1", email="r1@test.com")
+    schema = Schema(query=Query)
+
+    with patch("django_filters.filterset.BaseFilterSet.__init__") as init_mock:
+        result = schema.execute("{ allReporters { edges { node { id } } } }")
+        assert not result.errors
+        assert len(result.data["allReporters"]["edges"]) == 1
+
+        result = schema.execute(
+            '{ allReporters(firstName: "r2") { edges { node { id } } } }'
+        )
+        assert not result.errors
+        assert result.data["allReporters"]["edges"] == []
+
+    init_mock.assert_not_called()
+
+
+def test_filterset_fast_path_errors_match_form_errors():
+    from django.core.exceptions import ValidationError
+
+    from ..filterset import FilterSetFastPath, get_filterset_fast_path
+
+    field = DjangoFilterConnectionField(
+        ArticleNode, fields=["headline", "reporter", "pub_date"]
+    )
+    data = {"reporter": "fake_global_id", "pub_date": "not a date", "headline": "a"}
+
+    filterset = field.filterset_class(data=data, queryset=Article.objects.all())
+    assert not filterset.form.is_valid()
+
+    fast_path = get_filterset_fast_path(field.filterset_class)
+    assert isinstance(fast_path, FilterSetFastPath)
+    with pytest.raises(ValidationError) as exc_info:
+        fast_path.filter_queryset(Article.objects.all(), data)
+
+    assert exc_info.value.messages == [filterset.form.errors.as_json()]
+
+
+def test_filterset_fast_path_is_disabled_for_custom_filtersets():
+    from ..filterset import get_filterset_fast_path
+
+    class CustomReporterFilter(FilterSet):
+        class Meta:
+            model = Reporter
+            fields = ["first_name"]
+
+        @property
+        def qs(self):
+            return super(CustomReporterFilter, self).qs.filter(last_name="Doe")
+
+    class MethodReporterFilter(FilterSet):
+        class Meta:
+            model = Reporter
+            fields = ["first_name"]
+
+        name = django_filters.CharFilter(method="filter_name")
+
+        def filter_name(self, queryset, name, value):
+            return queryset.filter(first_name=value)
+
+    field = DjangoFilterConnectionField(
+        ReporterNode, filterset_class=CustomReporterFilter
+    )
+    assert get_filterset_fast_path(field.filterset_class) is None
+
+    field = DjangoFilterConnectionField(
+        ReporterNode, filterset_class=MethodReporterFilter
+    )
+    fast_path = get_filterset_fast_path(field.filterset_class)
+    assert fast_path.can_filter({"first_name": "John"})
+    assert not fast_path.can_filter({"first_name": "John", "name": "John"})
+
+
+def test_filterset_fast_path_compiles_a_plan_per_argument_shape():
+    from ..filterset import get_filterset_fast_path
+
+    field = DjangoFilterConnectionField(
+        ReporterNode, fields={"first_name": ["exact", "in"], "last_name": ["exact"]}
+    )
+    fast_path = get_filterset_fast_path(field.filterset_class)
+
+    plan = fast_path.get_plan({"last_name": "Doe", "first_name": "John"})
+    assert [step[0] for step in plan.steps] == ["first_name", "last_name"]
+    assert fast_path.get_plan({"first_name": "Jane", "last_name": "Roe"}) is plan
+    assert fast_path.get_plan({"first_name": "John"}) is not plan
+
+    Reporter.objects.create(first_name="John", last_name="Doe")
+    Reporter.objects.create(first_name="Jane", last_name="Doe")
+    queryset = fast_path.filter_queryset(
+        Reporter.objects.all(), {"first_name__in": ["John", "Bob"], "last_name": "Doe"}
+    )
+    assert [r.first_name for r in queryset] == ["John"]
+
+    fast_path.max_plans = 2
+    fast_path.get_plan({"first_name__in": []})
+    assert len(fast_path._plans) == 2
@@ -2,10 +2,13 @@ from datetime import datetime
 
 import pytest
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django_filters import FilterSet
 from django_filters import rest_framework as filters
 from graphene import ObjectType, Schema
 from graphene.relay import Node
+from mock import patch
 from graphene_django import DjangoObjectType
 from graphene_django.tests.models import Pet, Person, Reporter, Article, Film
 from graphene_django.filter.tests.filters import ArticleFilter
@@ -441,3 +444,213 @@ def test_enum_in_filter(query):
         {"node": {"email": "jean@bon.com"}},
         {"node": {"email": "jane@doe.com"}},
     ]
+
+
+@patch("graphene_django.settings.graphene_settings.FILTER_ARRAY_IN_THRESHOLD", 1)
+def test_in_filter_above_array_threshold(query):
+    """
+    Test in filters passing their values as a single array parameter.
+    """
+    john_doe = Reporter.objects.create(
+        first_name="John", last_name="Doe", email="john@doe.com"
+    )
+    jean_bon = Reporter.objects.create(
+        first_name="Jean", last_name="Bon", email="jean@bon.com"
+    )
+    Article.objects.create(
+        headline="A",
+        pub_date=datetime.now(),
+        pub_date_time=datetime.now(),
+        reporter=john_doe,
+        editor=john_doe,
+    )
+    Article.objects.create(
+        headline="B",
+        pub_date=datetime.now(),
+        pub_date_time=datetime.now(),
+        reporter=jean_bon,
+        editor=jean_bon,
+    )
+    Pet.objects.create(name="Brutus", age=12)
+    Pet.objects.create(name="Mimi", age=3)
+    Pet.objects.create(name="Jojo", age=5)
+
+    schema = Schema(query=query)
+
+    query = """
+    query {
+        pets (name_In: ["Brutus", "Jojo", "Rex"], age_In: [12, 3]) {
+            edges {
+                node {
+                    name
+                }
+            }
+        }
+        articles (reporter_In: [%s, %s]) {
+            edges {
+                node {
+                    headline
+                }
+            }
+        }
+    }
+    """ % (
+        john_doe.id,
+        jean_bon.id,
+    )
+    with CaptureQueriesContext(connection) as captured:
+        result = schema.execute(query)
+
+    assert not result.errors
+    assert result.data["pets"]["edges"] == [{"node": {"name": "Brutus"}}]
+    assert result.data["articles"]["edges"] == [
+        {"node": {"headline": "A"}},
+        {"node": {"headline": "B"}},
+    ]
+    assert any(
+        'IN (SELECT value FROM json_each(\'["Brutus", "Jojo", "Rex"]\'))'
+        in query["sql"]
+        for query in captured.captured_queries
+    )
+
+
+def test_array_in_lookup_drops_nulls_and_duplicates():
+    from graphene_django.filter.lookups import ArrayIn
+
+    Pet.objects.create(name="Brutus", age=12)
+    Pet.objects.create(name="Mimi", age=3)
+    lookup = "name__%s" % ArrayIn.lookup_name
+
+    with CaptureQueriesContext(connection) as captured:
+        pets = Pet.objects.filter(**{lookup: ["Mimi", None, "Mimi", "Rex"]})
+        assert [pet.name for pet in pets] == ["Mimi"]
+        assert not Pet.objects.filter(**{lookup: [None]}).exists()
+
+    assert 'json_each(\'["Mimi", "Rex"]\')' in captured.captured_queries[0]["sql"]
+    # Nothing can match, so there is no query
+    assert len(captured.captured_queries) == 1
+
+
+@patch("graphene_django.settings.graphene_settings.FILTER_ARRAY_IN_THRESHOLD", 1)
+def test_global_id_multiple_choice_filter_above_array_threshold():
+    from graphql_relay import to_global_id
+
+    from ..filters import GlobalIDMultipleChoiceFilter
+
+    john_doe = Reporter.objects.create(first_name="John", last_name="Doe")
+    jean_bon = Reporter.objects.create(first_name="Jean", last_name="Bon")
+    Reporter.objects.create(first_name="Sara", last_name="Croche")
+    articles = [
+        Article.objects.create(
+            headline=headline,
+            pub_date=datetime.now(),
+            pub_date_time=datetime.now(),
+            reporter=reporter,
+            editor=reporter,
+        )
+        for headline, reporter in [("A", john_doe), ("B", john_doe), ("C", jean_bon)]
+    ]
+    global_ids = [to_global_id("ArticleNode", article.id) for article in articles]
+
+    articles_filter = GlobalIDMultipleChoiceFilter(field_name="articles")
+    qs = articles_filter.filter(Reporter.objects.all(), global_ids)
+    assert "json_each" in str(qs.query)
+    assert list(qs.order_by("id")) == [john_doe, jean_bon]
+
+    articles_filter = GlobalIDMultipleChoiceFilter(
+        field_name="articles", array_threshold=10
+    )
+    qs = articles_filter.filter(Reporter.objects.all(), global_ids)
+    assert "json_each" not in str(qs.query)
+    assert list(qs.order_by("id")) == [john_doe, jean_bon]
+
+
+def test_global_id_multiple_choice_filter_validates_type_names():
+    from django.core.exceptions import ValidationError
+    from graphql_relay import to_global_id
+
+    from ..filters import GlobalIDMultipleChoiceFilter
+
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+
+    reporter = Reporter.objects.create(first_name="John", last_name="Doe")
+    article = Article.objects.create(
+        headline="A",
+        pub_date=datetime.now(),
+        pub_date_time=datetime.now(),
+        reporter=reporter,
+        editor=reporter,
+    )
+
+    articles_filter = GlobalIDMultipleChoiceFilter(field_name="articles")
+    with CaptureQueriesContext(connection) as captured:
+        qs = articles_filter.filter(
+            Reporter.objects.all(),
+            [to_global_id("ArticleType", article.id), to_global_id("Other", 0)],
+        )
+        assert list(qs) == [reporter]
+    # The primary keys are converted to integers in a single IN lookup
+    sql = captured.captured_queries[0]["sql"]
+    assert "IN (" in sql and " OR " not in sql and "'0'" not in sql
+
+    with pytest.raises(ValidationError):
+        articles_filter.filter(
+            Reporter.objects.all(), [to_global_id("ReporterType", reporter.id)]
+        )
+
+
+def test_global_id_multiple_choice_filter_uses_the_registry_of_the_node():
+    from django.core.exceptions import ValidationError
+    from graphql_relay import to_global_id
+
+    from ...registry import Registry
+    from ..filters import GlobalIDMultipleChoiceFilter
+
+    custom_registry = Registry()
+
+    class GlobalThingType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            name = "Thing"
+
+    class ThingType(DjangoObjectType):
+        class Meta:
+            model = Article
+            name = "Thing"
+            registry = custom_registry
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            fields = ("first_name", "articles")
+            filter_fields = ("articles",)
+            registry = custom_registry
+
+    reporter = Reporter.objects.create(first_name="John", last_name="Doe")
+    article = Article.objects.create(
+        headline="A",
+        pub_date=datetime.now(),
+        pub_date_time=datetime.now(),
+        reporter=reporter,
+        editor=reporter,
+    )
+    global_ids = [to_global_id("Thing", article.id)]
+
+    with pytest.raises(ValidationError):
+        GlobalIDMultipleChoiceFilter(field_name="articles").filter(
+            Reporter.objects.all(), global_ids
+        )
+
+    reporters = DjangoFilterConnectionField(ReporterType)
+    articles_filter = reporters.filterset_class.base_filters["articles"]
+    assert articles_filter.registry is custom_registry
+    assert list(articles_filter.filter(Reporter.objects.all(), global_ids)) == [
+        reporter
+    ]
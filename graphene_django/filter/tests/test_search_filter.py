@@ -0,0 +1,166 @@
+import pytest
+
+from django.core.exceptions import ImproperlyConfigured
+from graphene import ObjectType, Schema
+from graphene.relay import Node
+from graphene_django import DjangoObjectType
+from graphene_django.tests.models import Reporter
+from graphene_django.utils import DJANGO_FILTER_INSTALLED
+
+pytestmark = []
+
+if DJANGO_FILTER_INSTALLED:
+    from django_filters import FilterSet
+
+    from graphene_django.filter import DjangoFilterConnectionField, SearchFilter
+else:
+    pytestmark.append(
+        pytest.mark.skipif(
+            True, reason="django_filters not installed or not compatible"
+        )
+    )
+
+
+@pytest.fixture
+def schema():
+    class ReporterFilter(FilterSet):
+        search = SearchFilter(search_fields=["first_name", "last_name", "email"])
+
+        class Meta:
+            model = Reporter
+            fields = ["first_name"]
+
+    class ReporterNode(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            filterset_class = ReporterFilter
+
+    class Query(ObjectType):
+        reporters = DjangoFilterConnectionField(ReporterNode)
+
+    return Schema(query=Query)
+
+
+def test_search_filter_orders_by_rank(schema):
+    Reporter.objects.create(first_name="John", last_name="Doe", email="jd@a.com")
+    Reporter.objects.create(first_name="Jane", last_name="Doe", email="doe@a.com")
+    Reporter.objects.create(first_name="Doe", last_name="Doe", email="doe@b.com")
+    Reporter.objects.create(first_name="Bob", last_name="Roe", email="bob@a.com")
+
+    query = """
+        query {
+            reporters(search: "doe", first: 2) {
+                edges {
+                    node {
+                        firstName
+                    }
+                }
+                pageInfo {
+                    hasNextPage
+                    endCursor
+                }
+            }
+        }
+    """
+    result = schema.execute(query)
+    assert not result.errors
+    reporters = result.data["reporters"]
+    assert [edge["node"]["firstName"] for edge in reporters["edges"]] == [
+        "Doe",
+        "Jane",
+    ]
+    assert reporters["pageInfo"]["hasNextPage"]
+
+    query = """
+        query {
+            reporters(search: "doe", first: 2, after: "%s") {
+                edges {
+                    node {
+                        firstName
+                    }
+                }
+            }
+        }
+    """ % (
+        reporters["pageInfo"]["endCursor"]
+    )
+    result = schema.execute(query)
+    assert not result.errors
+    assert [
+        edge["node"]["firstName"] for edge in result.data["reporters"]["edges"]
+    ] == ["John"]
+
+
+def test_search_filter_combined_with_other_filters(schema):
+    Reporter.objects.create(first_name="John", last_name="Doe", email="jd@a.com")
+    Reporter.objects.create(first_name="Jane", last_name="Doe", email="doe@a.com")
+
+    result = schema.execute(
+        """
+        query {
+            reporters(search: "doe", firstName: "John") {
+                edges {
+                    node {
+                        firstName
+                    }
+                }
+            }
+        }
+        """
+    )
+    assert not result.errors
+    assert [
+        edge["node"]["firstName"] for edge in result.data["reporters"]["edges"]
+    ] == ["John"]
+
+
+def test_search_filter_needs_fields():
+    with pytest.raises(ImproperlyConfigured):
+        SearchFilter()
+
+    search_filter = SearchFilter(vector_field="search_vector", field_name="search")
+    # Only PostgreSQL can search on a search vector
+    with pytest.raises(ImproperlyConfigured):
+        search_filter.filter(Reporter.objects.all(), "doe")
+
+
+def test_search_filter_builds_trigram_similarity():
+    from django.contrib.postgres.search import TrigramSimilarity
+    from django.db.models.functions import Greatest
+
+    search_filter = SearchFilter(
+        search_fields=["first_name", "last_name"],
+        trigram=True,
+        trigram_threshold=0.5,
+        field_name="search",
+    )
+    qs = search_filter.filter_trigram(Reporter.objects.all(), "doe")
+    rank = qs.query.annotations["search_rank"]
+    assert isinstance(rank, Greatest)
+    assert all(
+        isinstance(similarity, TrigramSimilarity)
+        for similarity in rank.get_source_expressions()
+    )
+    (lookup,) = qs.query.where.children
+    assert lookup.lookup_name == "gt"
+    assert lookup.rhs == 0.5
+
+
+def test_search_filter_builds_search_query_on_vector_field():
+    from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+    search_filter = SearchFilter(
+        vector_field="search_vector",
+        config="english",
+        search_type="phrase",
+        field_name="search",
+    )
+    qs = Reporter.objects.annotate(search_vector=SearchVector("first_name"))
+    qs = search_filter.filter_search_query(qs, "john doe")
+    assert list(qs.query.annotations) == ["search_vector", "search_rank"]
+    assert isinstance(qs.query.annotations["search_rank"], SearchRank)
+    (lookup,) = qs.query.where.children
+    assert isinstance(lookup.rhs, SearchQuery)
+    assert lookup.rhs.search_type == "phrase"
+    assert lookup.rhs.config.value == "english"
@@ -1,3 +1,5 @@
+from copy import deepcopy
+
 import six
 
 import graphene
@@ -8,7 +10,13 @@ from django_filters.utils import get_model_field, get_field_parts
 from django_filters.filters import Filter, BaseCSVFilter
 
 from .filterset import custom_filterset_factory, setup_filterset
-from .filters import ArrayFilter, ListFilter, RangeFilter, TypedFilter
+from .filters import (
+    ArrayFilter,
+    GlobalIDMultipleChoiceFilter,
+    ListFilter,
+    RangeFilter,
+    TypedFilter,
+)
 from ..forms import GlobalIDFormField, GlobalIDMultipleChoiceField
 
 
@@ -27,11 +35,49 @@ def get_field_type(registry, model, field_name):
     return None
 
 
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _get_cache_key(*parts):
+    """
+    Return a hashable key for `parts`, or None if they can't be hashed.
+    """
+    key = _freeze(parts)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+_filtering_args = {}
+_filterset_classes = {}
+
+
 def get_filtering_args_from_filterset(filterset_class, type):
     """
     Inspect a FilterSet and produce the arguments to pass to a Graphene Field.
     These arguments will be available to filter against in the GraphQL API.
+
+    The arguments are memoized per FilterSet class and type, so that the
+    connection fields of all the relations to a type share them.
     """
+    key = (filterset_class, type)
+    try:
+        return _filtering_args[key]
+    except KeyError:
+        args = _filtering_args[key] = _get_filtering_args_from_filterset(
+            filterset_class, type
+        )
+        return args
+
+
+def _get_filtering_args_from_filterset(filterset_class, type):
     from ..forms.converter import convert_form_field
 
     args = {}
@@ -105,10 +151,25 @@ def get_filtering_args_from_filterset(filterset_class, type):
     return args
 
 
-def get_filterset_class(filterset_class, **meta):
+def get_filterset_class(filterset_class, registry=None, **meta):
     """
     Get the class to be used as the FilterSet.
+
+    The class is memoized per provided FilterSet class, meta options and
+    `registry`, the registry of the types of the global IDs to filter on.
     """
+    key = _get_cache_key(filterset_class, meta, registry)
+    graphene_filterset_class = _filterset_classes.get(key) if key else None
+    if graphene_filterset_class is None:
+        graphene_filterset_class = _get_filterset_class(
+            filterset_class, registry, **meta
+        )
+        if key is not None:
+            _filterset_classes[key] = graphene_filterset_class
+    return graphene_filterset_class
+
+
+def _get_filterset_class(filterset_class, registry=None, **meta):
     if filterset_class:
         # If were given a FilterSet class, then set it up.
         graphene_filterset_class = setup_filterset(filterset_class)
@@ -117,9 +178,28 @@ def get_filterset_class(filterset_class, **meta):
         graphene_filterset_class = custom_filterset_factory(**meta)
 
     replace_csv_filters(graphene_filterset_class)
+    if registry is not None:
+        set_global_id_registry(graphene_filterset_class, registry)
     return graphene_filterset_class
 
 
+def set_global_id_registry(filterset_class, registry):
+    """
+    Look up the type names of the global ID filters of `filterset_class`
+    without a registry in `registry`.
+    """
+    base_filters = filterset_class.base_filters
+    for name, filter_field in list(base_filters.items()):
+        if (
+            isinstance(filter_field, GlobalIDMultipleChoiceFilter)
+            and filter_field.registry is None
+        ):
+            # Declared filters are shared with the provided FilterSet class
+            filter_field = deepcopy(filter_field)
+            filter_field.registry = registry
+            base_filters[name] = filter_field
+
+
 def replace_csv_filters(filterset_class):
     """
     Replace the "in" and "range" filters (that are not explicitly declared)
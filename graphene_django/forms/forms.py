@@ -6,6 +6,8 @@ from django.utils.translation import gettext_lazy as _
 
 from graphql_relay import from_global_id
 
+from ..utils import from_global_ids
+
 
 class GlobalIDFormField(Field):
     default_error_messages = {"invalid": _("Invalid ID specified.")}
@@ -34,6 +36,19 @@ class GlobalIDMultipleChoiceField(MultipleChoiceField):
         "invalid_list": _("Enter a list of values."),
     }
 
+    def validate(self, value):
+        if self.required and not value:
+            raise ValidationError(self.error_messages["required"], code="required")
+        # Decode all the IDs at once rather than validating them one by one
+        try:
+            from_global_ids(value)
+        except ValueError as e:
+            raise ValidationError(
+                self.error_messages["invalid_choice"],
+                code="invalid_choice",
+                params={"value": e.args[0]},
+            )
+
     def valid_value(self, value):
         # Clean will raise a validation error if there is a problem
         GlobalIDFormField().clean(value)
@@ -0,0 +1,78 @@
+from django.core.exceptions import ValidationError
+from django.db.models import Model
+
+from .settings import graphene_settings
+
+# Attribute of the context (the request) holding its identity map
+IDENTITY_MAP_ATTRIBUTE = "_graphene_identity_map"
+
+
+class IdentityMap(object):
+    """
+    Model instances loaded while executing an operation, keyed on their
+    model and primary key, so that a row is only loaded once and always
+    resolved to the same instance.
+    """
+
+    def __init__(self):
+        self._instances = {}
+
+    def get_key(self, model, pk):
+        try:
+            return model, model._meta.pk.to_python(pk)
+        except ValidationError:
+            return None
+
+    def get(self, model, pk):
+        key = self.get_key(model, pk)
+        return self._instances.get(key) if key else None
+
+    def add(self, instance):
+        """
+        Return the instance already mapped to the row of `instance`,
+        mapping `instance` if there is none.
+        """
+        if not isinstance(instance, Model) or instance.pk is None:
+            return instance
+        key = (instance._meta.model, instance.pk)
+        return self._instances.setdefault(key, instance)
+
+    def add_all(self, instances):
+        return [self.add(instance) for instance in instances]
+
+    def clear(self):
+        self._instances.clear()
+
+    def __len__(self):
+        return len(self._instances)
+
+
+def uses_identity_map(django_object_type):
+    identity_map = getattr(django_object_type._meta, "identity_map", None)
+    if identity_map is None:
+        return graphene_settings.DJANGO_OBJECT_TYPE_IDENTITY_MAP
+    return identity_map
+
+
+def get_identity_map(info, django_object_type):
+    """
+    Return the identity map of the operation being executed, or None if
+    `django_object_type` doesn't use it or the context can't hold it.
+    """
+    if not uses_identity_map(django_object_type):
+        return None
+
+    context = info.context
+    if context is None:
+        return None
+    if isinstance(context, dict):
+        return context.setdefault(IDENTITY_MAP_ATTRIBUTE, IdentityMap())
+
+    identity_map = getattr(context, IDENTITY_MAP_ATTRIBUTE, None)
+    if identity_map is None:
+        identity_map = IdentityMap()
+        try:
+            setattr(context, IDENTITY_MAP_ATTRIBUTE, identity_map)
+        except AttributeError:
+            return None
+    return identity_map
@@ -0,0 +1,100 @@
+import hashlib
+import json
+import re
+
+from graphql import graphql
+from graphql.utils.introspection_query import introspection_query
+
+# Comments, whitespace and commas are insignificant in GraphQL documents
+IGNORED_TOKENS_RE = re.compile(r"#[^\n\r]*|[\s,]+")
+PUNCTUATOR_SPACES_RE = re.compile(r" ?([!$():=@\[\]{|}]) ?")
+
+
+def normalize_query(query):
+    """
+    Collapse the insignificant characters of a GraphQL document so that
+    equivalent documents written with a different layout compare equal.
+    """
+    query = IGNORED_TOKENS_RE.sub(" ", query).strip()
+    return PUNCTUATOR_SPACES_RE.sub(r"\1", query)
+
+
+def get_query_hash(query):
+    return hashlib.sha256(normalize_query(query).encode("utf-8")).hexdigest()
+
+
+INTROSPECTION_QUERY_HASH = get_query_hash(introspection_query)
+INTROSPECTION_QUERY_HASHES = set([INTROSPECTION_QUERY_HASH])
+
+
+def register_introspection_query(query):
+    """
+    Mark ``query`` as an introspection query whose response can be cached,
+    for instance the one sent by a code generation tool.
+    """
+    INTROSPECTION_QUERY_HASHES.add(get_query_hash(query))
+
+
+def is_introspection_query(query):
+    return get_query_hash(query) in INTROSPECTION_QUERY_HASHES
+
+
+def introspect_schema(schema, query=introspection_query):
+    """
+    Return the response to the introspection ``query`` for ``schema``,
+    in the format dumped by the ``graphql_schema`` command.
+    """
+    result = graphql(schema, query)
+    if result.errors:
+        raise result.errors[0]
+    return {"data": result.data}
+
+
+class IntrospectionResult(object):
+    def __init__(self, response):
+        self.response = response
+        self.content = json.dumps(response, separators=(",", ":"))
+
+
+_introspection_results = {}
+
+
+def get_introspection_result(
+    schema, query, operation_name=None, introspection_file=None
+):
+    """
+    Return the cached IntrospectionResult of ``query`` for ``schema``, or
+    None if ``query`` isn't a registered introspection query.
+
+    The response is computed the first time it is requested, or loaded from
+    ``introspection_file`` (a JSON file dumped by the ``graphql_schema``
+    command) when the standard introspection query is requested.
+    """
+    query_hash = get_query_hash(query)
+    if query_hash not in INTROSPECTION_QUERY_HASHES:
+        return None
+
+    if introspection_file and query_hash == INTROSPECTION_QUERY_HASH:
+        key = (schema, introspection_file, operation_name)
+    else:
+        key = (schema, query_hash, operation_name)
+        introspection_file = None
+
+    result = _introspection_results.get(key)
+    if result is None:
+        if introspection_file:
+            with open(introspection_file) as f:
+                response = json.load(f)
+        else:
+            execution_result = graphql(schema, query, operation_name=operation_name)
+            if execution_result.errors:
+                # Let the regular execution report the errors
+                return None
+            response = {"data": execution_result.data}
+        result = IntrospectionResult(response)
+        _introspection_results[key] = result
+    return result
+
+
+def clear_introspection_results():
+    _introspection_results.clear()
@@ -0,0 +1,251 @@
+"""
+Experimental: build the objects of a list in the database as JSON, so that
+the model instances are never created.
+"""
+import json
+from collections import OrderedDict
+from decimal import Decimal
+
+from django.db import DatabaseError, connections
+from django.db.models import Case, F, Func, TextField, Value, When
+from django.db.models.functions import Cast
+from django.db.models.query import ModelIterable, QuerySet, ValuesIterable
+from graphql.language.ast import FragmentSpread, InlineFragment
+
+from graphene import Dynamic
+
+from .values import get_row_class, get_selected_model_fields
+
+# Annotation holding the JSON object of each row
+JSON_ANNOTATION = "_graphene_json"
+
+# Fields whose values can be read back from JSON with `to_python`
+JSON_FIELD_TYPES = (
+    "AutoField",
+    "BigAutoField",
+    "SmallAutoField",
+    "BigIntegerField",
+    "IntegerField",
+    "PositiveIntegerField",
+    "PositiveSmallIntegerField",
+    "SmallIntegerField",
+    "BooleanField",
+    "NullBooleanField",
+    "CharField",
+    "TextField",
+    "SlugField",
+    "FloatField",
+    "DecimalField",
+    "DateField",
+    "TimeField",
+    "UUIDField",
+)
+
+
+class JSONObject(Func):
+    """
+    JSON object of the `fields` mapping of keys to expressions.
+    """
+
+    output_field = TextField()
+
+    def __init__(self, fields):
+        expressions = []
+        for key, expression in fields.items():
+            expressions.extend((Value(key), expression))
+        super(JSONObject, self).__init__(*expressions)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, function="JSON_OBJECT")
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, function="JSON_BUILD_OBJECT")
+
+
+class NestedJSON(Func):
+    """
+    JSON value of a text `expression`, to nest it into a JSON object.
+    """
+
+    function = "JSON"
+    output_field = TextField()
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        # JSON_BUILD_OBJECT already returns json
+        return compiler.compile(self.get_source_expressions()[0])
+
+
+_json_support = {}
+
+
+def supports_json_pushdown(alias):
+    """
+    Whether the database `alias` can build JSON objects.
+    """
+    if alias not in _json_support:
+        connection = connections[alias]
+        supported = connection.vendor == "postgresql"
+        if connection.vendor == "sqlite":
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT JSON_OBJECT('a', 1)")
+                supported = True
+            except DatabaseError:
+                supported = False
+        _json_support[alias] = supported
+    return _json_support[alias]
+
+
+def collect_fields(info, selection_sets):
+    """
+    Return the selection sets of the fields selected in `selection_sets` by
+    GraphQL name, including the ones selected through fragments.
+    """
+    fields = OrderedDict()
+
+    def collect(selection_set):
+        for selection in selection_set.selections:
+            if isinstance(selection, FragmentSpread):
+                collect(info.fragments[selection.name.value].selection_set)
+            elif isinstance(selection, InlineFragment):
+                collect(selection.selection_set)
+            else:
+                selection_sets = fields.setdefault(selection.name.value, [])
+                if selection.selection_set:
+                    selection_sets.append(selection.selection_set)
+
+    for selection_set in selection_sets:
+        collect(selection_set)
+    return fields
+
+
+def get_selection_sets(info, path=()):
+    selection_sets = [
+        field_ast.selection_set
+        for field_ast in info.field_asts
+        if field_ast.selection_set
+    ]
+    for name in path:
+        selection_sets = collect_fields(info, selection_sets).get(name, [])
+    return selection_sets
+
+
+class JSONPlan(object):
+    """
+    Columns and forward relations of `model` making up the JSON objects of
+    its rows, keyed on their field names.
+    """
+
+    def __init__(self, model, columns, relations):
+        self.model = model
+        self.columns = columns
+        self.relations = relations
+
+    def get_expression(self, prefix=""):
+        fields = OrderedDict(
+            (name, F(prefix + model_field.attname))
+            for name, model_field in self.columns
+        )
+        for name, model_field, plan in self.relations:
+            path = prefix + model_field.name
+            fields[name] = NestedJSON(
+                Case(
+                    When(**{path + "__isnull": True}, then=Value(None)),
+                    default=plan.get_expression(path + "__"),
+                    output_field=TextField(),
+                )
+            )
+        return JSONObject(fields)
+
+    def to_row(self, data):
+        row = get_row_class(self.model)()
+        for name, model_field in self.columns:
+            value = data.get(name)
+            row[name] = None if value is None else model_field.to_python(value)
+        for name, model_field, plan in self.relations:
+            value = data.get(name)
+            row[name] = None if value is None else plan.to_row(value)
+        return row
+
+
+def get_json_plan(django_object_type, info, selection_sets):
+    """
+    Return the JSONPlan of the fields selected on `django_object_type`, or
+    None if one of them can't be read from the JSON object of its row.
+    """
+    from .types import DjangoObjectType
+
+    model = django_object_type._meta.model
+    fields = collect_fields(info, selection_sets)
+    model_fields = get_selected_model_fields(django_object_type, info, fields.keys())
+    if model_fields is None:
+        return None
+
+    pk = model._meta.pk
+    columns = OrderedDict([(pk.attname, pk)])
+    relations = []
+    for graphql_name, name, model_field in model_fields:
+        if not model_field.is_relation:
+            if model_field.get_internal_type() not in JSON_FIELD_TYPES:
+                return None
+            columns[name] = model_field
+            continue
+
+        field = django_object_type._meta.fields[name]
+        related_field = field.get_type() if isinstance(field, Dynamic) else None
+        related_type = getattr(related_field, "type", None)
+        related_type = getattr(related_type, "of_type", related_type)
+        if not (
+            isinstance(related_type, type)
+            and issubclass(related_type, DjangoObjectType)
+            # The relation is resolved through get_node and get_queryset
+            and related_type.get_node.__func__ is DjangoObjectType.get_node.__func__
+            and related_type.get_queryset.__func__
+            is DjangoObjectType.get_queryset.__func__
+        ):
+            return None
+        plan = get_json_plan(related_type, info, fields[graphql_name])
+        if plan is None:
+            return None
+        relations.append((name, model_field, plan))
+    return JSONPlan(model, list(columns.items()), relations)
+
+
+class JSONRowIterable(ValuesIterable):
+    plan = None
+
+    def __iter__(self):
+        for row in super(JSONRowIterable, self).__iter__():
+            data = row.pop(JSON_ANNOTATION)
+            if not isinstance(data, dict):
+                data = json.loads(data, parse_float=Decimal)
+            json_row = self.plan.to_row(data)
+            # Other annotations, e.g. the window count of connections
+            json_row.update(row)
+            yield json_row
+
+
+def get_json_queryset(queryset, django_object_type, info, path=()):
+    """
+    Return `queryset` fetching the rows as JSON objects built by the
+    database if the fields selected on `path` from the field being resolved
+    are columns or forward relations only read by the default resolvers,
+    `queryset` otherwise.
+    """
+    if (
+        not isinstance(queryset, QuerySet)
+        or queryset._iterable_class is not ModelIterable
+        or queryset._prefetch_related_lookups
+        or not supports_json_pushdown(queryset.db)
+    ):
+        return queryset
+    plan = get_json_plan(django_object_type, info, get_selection_sets(info, path))
+    if plan is None:
+        return queryset
+    queryset = queryset.annotate(
+        **{JSON_ANNOTATION: Cast(plan.get_expression(), TextField())}
+    ).values(JSON_ANNOTATION)
+    queryset._iterable_class = type(
+        str("JSONRowIterable"), (JSONRowIterable,), {"plan": plan}
+    )
+    return queryset
@@ -0,0 +1,242 @@
+import importlib
+
+import six
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models
+
+from graphene_django.settings import graphene_settings
+from graphene_django.types import DjangoObjectType
+from graphene_django.utils import DJANGO_FILTER_INSTALLED
+
+# Lookups which can use a B-tree index on the column
+INDEXABLE_LOOKUPS = (
+    "exact",
+    "in",
+    "gt",
+    "gte",
+    "lt",
+    "lte",
+    "range",
+    "isnull",
+    "startswith",
+    "year",
+    "date",
+)
+
+# Lookups using the column for equality, worth leading a multi-column index
+EQUALITY_LOOKUPS = ("exact", "in", "isnull")
+
+
+def get_model_indexes(model):
+    """
+    Return the tuples of field names covered by an index on `model`, in
+    index column order.
+    """
+    opts = model._meta
+    indexes = []
+    for field in opts.local_fields:
+        if field.primary_key or field.unique or field.db_index:
+            indexes.append((field.name,))
+    for index in opts.indexes:
+        indexes.append(tuple(name.lstrip("-") for name in index.fields))
+    for fields in list(opts.unique_together) + list(opts.index_together):
+        indexes.append(tuple(fields))
+    for constraint in getattr(opts, "constraints", []):
+        if isinstance(
+            constraint, getattr(models, "UniqueConstraint", ())
+        ) and not getattr(constraint, "condition", None):
+            indexes.append(tuple(constraint.fields))
+    return [index for index in indexes if index]
+
+
+def is_indexed(model, field_names):
+    field_names = tuple(field_names)
+    return any(
+        index[: len(field_names)] == field_names for index in get_model_indexes(model)
+    )
+
+
+def resolve_path(model, path):
+    """
+    Follow the `__` separated `path` from `model` and return the model and
+    field holding its last column, or None if the path isn't a model field.
+    """
+    field = None
+    for name in path.split("__"):
+        if field is not None:
+            if not field.is_relation:
+                return None
+            model = field.related_model
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+    return model, field
+
+
+class Command(BaseCommand):
+    help = (
+        "Report the filter and ordering fields of the schema types which are "
+        "not supported by a database index"
+    )
+    can_import_settings = True
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--schema",
+            type=str,
+            dest="schema",
+            default=None,
+            help="Module path of the schema to check, e.g. myproject.core.schema.schema",
+        )
+
+    def get_schema(self, options):
+        schema = options.get("schema")
+        if schema and isinstance(schema, six.string_types):
+            module_str, schema_name = schema.rsplit(".", 1)
+            schema = getattr(importlib.import_module(module_str), schema_name)
+        schema = schema or graphene_settings.SCHEMA
+        if not schema:
+            raise CommandError(
+                "Specify schema on GRAPHENE.SCHEMA setting or by using --schema"
+            )
+        return schema
+
+    def get_django_types(self, schema):
+        django_types = []
+        for graphql_type in schema.get_type_map().values():
+            graphene_type = getattr(graphql_type, "graphene_type", None)
+            if isinstance(graphene_type, type) and issubclass(
+                graphene_type, DjangoObjectType
+            ):
+                django_types.append(graphene_type)
+        return sorted(django_types, key=lambda django_type: django_type._meta.name)
+
+    def get_filters(self, django_type):
+        """
+        Return the (path, lookup) pairs of the filters and the ordering paths
+        of the FilterSet of `django_type`.
+        """
+        meta = django_type._meta
+        filterset_class = getattr(meta, "filterset_class", None)
+        filter_fields = getattr(meta, "filter_fields", None)
+        if not DJANGO_FILTER_INSTALLED or not (filterset_class or filter_fields):
+            return [], []
+
+        from django_filters import OrderingFilter
+
+        from graphene_django.filter.utils import get_filterset_class
+
+        filterset_class = get_filterset_class(
+            filterset_class, model=meta.model, fields=filter_fields
+        )
+        filters, orderings = [], []
+        for filter_field in filterset_class.base_filters.values():
+            if isinstance(filter_field, OrderingFilter):
+                orderings.extend(filter_field.param_map.values())
+            elif not filter_field.method and filter_field.field_name:
+                filters.append((filter_field.field_name, filter_field.lookup_expr))
+        return filters, orderings
+
+    def get_default_ordering(self, model):
+        return [
+            name.lstrip("-")
+            for name in model._meta.ordering
+            if isinstance(name, six.string_types) and name != "?"
+        ]
+
+    def check_type(self, django_type):
+        """
+        Return the report lines of `django_type`.
+        """
+        model = django_type._meta.model
+        filters, orderings = self.get_filters(django_type)
+        orderings = orderings + self.get_default_ordering(model)
+
+        lines = []
+        reported = set()
+
+        def report(kind, path, message):
+            if (kind, path) not in reported:
+                reported.add((kind, path))
+                lines.append("  {} {}: {}".format(kind, path, message))
+
+        equality_fields = []
+        for path, lookup in filters:
+            resolved = resolve_path(model, path)
+            if resolved is None:
+                continue
+            field_model, field = resolved
+            if field.many_to_many or not field.concrete:
+                # Joined through an indexed foreign key
+                continue
+            if lookup not in INDEXABLE_LOOKUPS:
+                report(
+                    "filter",
+                    "{}__{}".format(path, lookup),
+                    "B-tree indexes can't be used for `{}`, consider a "
+                    "trigram index or a SearchFilter".format(lookup),
+                )
+                continue
+            if not is_indexed(field_model, [field.name]):
+                report(
+                    "filter",
+                    path,
+                    "no index on {}.{}".format(
+                        field_model._meta.db_table, field.column
+                    ),
+                )
+            if field_model is model and lookup in EQUALITY_LOOKUPS:
+                if field.name not in equality_fields:
+                    equality_fields.append(field.name)
+
+        ordering_fields = []
+        for path in orderings:
+            resolved = resolve_path(model, path)
+            if resolved is None:
+                continue
+            field_model, field = resolved
+            if not field.concrete or field.many_to_many:
+                continue
+            if not is_indexed(field_model, [field.name]):
+                report(
+                    "ordering",
+                    path,
+                    "no index on {}.{}".format(
+                        field_model._meta.db_table, field.column
+                    ),
+                )
+            if field_model is model and field.name not in ordering_fields:
+                ordering_fields.append(field.name)
+
+        # Filtering on a column then ordering on another is best served by an
+        # index on both columns
+        for equality_field in equality_fields:
+            for ordering_field in ordering_fields:
+                if ordering_field == equality_field:
+                    continue
+                fields = [equality_field, ordering_field]
+                if not is_indexed(model, fields):
+                    lines.append(
+                        "  suggestion: models.Index(fields={!r})".format(fields)
+                    )
+        return lines
+
+    def handle(self, *args, **options):
+        schema = self.get_schema(options)
+
+        checked = 0
+        for django_type in self.get_django_types(schema):
+            checked += 1
+            lines = self.check_type(django_type)
+            if lines:
+                self.stdout.write(
+                    "{} ({})".format(
+                        django_type._meta.name, django_type._meta.model._meta.label
+                    )
+                )
+                for line in lines:
+                    self.stdout.write(line)
+
+        self.stdout.write("Checked {} types".format(checked))
@@ -1,12 +1,19 @@
+import difflib
 import os
 import importlib
 import json
 import functools
+import sys
+import time
+import traceback
+
+import six
 
 from django.core.management.base import BaseCommand, CommandError
 from django.utils import autoreload
 
 from graphql import print_schema
+from graphene_django.introspection import introspect_schema
 from graphene_django.settings import graphene_settings
 
 
@@ -44,50 +51,138 @@ class CommandArguments(BaseCommand):
             help="Updates the schema on file changes (default: False)",
         )
 
+        parser.add_argument(
+            "--check",
+            dest="check",
+            default=False,
+            action="store_true",
+            help="Exits with an error if the output file is out of date "
+            "instead of writing it (default: False)",
+        )
+
 
 class Command(CommandArguments):
     help = "Dump Graphene schema as a JSON or GraphQL file"
     can_import_settings = True
     requires_system_checks = False
 
-    def save_json_file(self, out, schema_dict, indent):
-        with open(out, "w") as outfile:
-            json.dump(schema_dict, outfile, indent=indent, sort_keys=True)
-
-    def save_graphql_file(self, out, schema):
-        with open(out, "w") as outfile:
-            outfile.write(print_schema(schema))
-
     def get_schema(self, schema, out, indent):
-        schema_dict = {"data": schema.introspect()}
-        if out == "-" or out == "-.json":
-            self.stdout.write(json.dumps(schema_dict, indent=indent, sort_keys=True))
-        elif out == "-.graphql":
-            self.stdout.write(print_schema(schema))
-        else:
-            # Determine format
-            _, file_extension = os.path.splitext(out)
-
-            if file_extension == ".graphql":
-                self.save_graphql_file(out, schema)
-            elif file_extension == ".json":
-                self.save_json_file(out, schema_dict, indent)
-            else:
-                raise CommandError(
-                    'Unrecognised file format "{}"'.format(file_extension)
+        self.write_schema_output(out, self.get_schema_output(schema, out, indent))
+
+    def get_schema_output(self, schema, out, indent):
+        if out == "-":
+            out = "-.json"
+        _, file_extension = os.path.splitext(out)
+
+        if file_extension == ".graphql":
+            return print_schema(schema)
+        elif file_extension == ".json":
+            schema_dict = introspect_schema(schema)
+            return json.dumps(schema_dict, indent=indent, sort_keys=True)
+        raise CommandError('Unrecognised file format "{}"'.format(file_extension))
+
+    def check_schema(self, schema, out, indent):
+        if out.startswith("-"):
+            raise CommandError("--check requires an output file")
+
+        output = self.get_schema_output(schema, out, indent)
+        try:
+            with open(out) as outfile:
+                current_output = outfile.read()
+        except IOError:
+            current_output = ""
+
+        if current_output != output:
+            self.stdout.writelines(
+                difflib.unified_diff(
+                    current_output.splitlines(True),
+                    output.splitlines(True),
+                    fromfile=out,
+                    tofile="schema",
                 )
+            )
+            raise CommandError("GraphQL schema in {} is out of date".format(out))
+
+        self.stdout.write("GraphQL schema in {} is up to date".format(out))
+
+    def get_watched_files(self, module_str):
+        package = importlib.import_module(module_str.split(".", 1)[0])
+        root = os.path.dirname(os.path.abspath(package.__file__))
+
+        mtimes = {}
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                if filename.endswith(".py"):
+                    path = os.path.join(dirpath, filename)
+                    mtimes[path] = os.stat(path).st_mtime
+        return mtimes
+
+    def reload_schema(self, module_str, schema_name, changed_files):
+        """
+        Reload the modules of the changed files, then the schema module, and
+        return the new schema.
+        """
+        changed_files = set(changed_files)
+        for module in list(sys.modules.values()):
+            module_file = getattr(module, "__file__", None)
+            if module_file and os.path.abspath(module_file) in changed_files:
+                if module.__name__ != module_str:
+                    six.moves.reload_module(module)
+
+        mod = six.moves.reload_module(importlib.import_module(module_str))
+        return getattr(mod, schema_name)
+
+    def write_schema_output(self, out, output):
+        if out.startswith("-"):
+            self.stdout.write(output)
+            return
+
+        with open(out, "w") as outfile:
+            outfile.write(output)
 
-            style = getattr(self, "style", None)
-            success = getattr(style, "SUCCESS", lambda x: x)
+        style = getattr(self, "style", None)
+        success = getattr(style, "SUCCESS", lambda x: x)
+        self.stdout.write(
+            success("Successfully dumped GraphQL schema to {}".format(out))
+        )
 
-            self.stdout.write(
-                success("Successfully dumped GraphQL schema to {}".format(out))
-            )
+    def watch_schema(self, module_str, schema_name, out, indent, interval=1):
+        """
+        Rewrite the output every time the schema changes, reloading only the
+        changed modules and the schema module in this process.
+        """
+        mtimes = self.get_watched_files(module_str)
+        schema = getattr(importlib.import_module(module_str), schema_name)
+        output = self.get_schema_output(schema, out, indent)
+        self.write_schema_output(out, output)
+
+        while True:
+            time.sleep(interval)
+            new_mtimes = self.get_watched_files(module_str)
+            changed_files = [
+                path for path, mtime in new_mtimes.items() if mtimes.get(path) != mtime
+            ]
+            mtimes = new_mtimes
+            if not changed_files:
+                continue
+
+            try:
+                schema = self.reload_schema(module_str, schema_name, changed_files)
+                new_output = self.get_schema_output(schema, out, indent)
+            except Exception:
+                self.stderr.write(traceback.format_exc())
+                continue
+
+            if new_output != output:
+                output = new_output
+                self.write_schema_output(out, output)
 
     def handle(self, *args, **options):
         options_schema = options.get("schema")
 
+        schema_path = None
         if options_schema and type(options_schema) is str:
+            schema_path = options_schema
             module_str, schema_name = options_schema.rsplit(".", 1)
             mod = importlib.import_module(module_str)
             schema = getattr(mod, schema_name)
@@ -105,9 +200,19 @@ class Command(CommandArguments):
                 "Specify schema on GRAPHENE.SCHEMA setting or by using --schema"
             )
 
+        if schema_path is None and schema is graphene_settings.SCHEMA:
+            schema_path = graphene_settings.user_settings.get("SCHEMA")
+            if not isinstance(schema_path, six.string_types):
+                schema_path = None
+
         indent = options.get("indent")
         watch = options.get("watch")
-        if watch:
+        if options.get("check"):
+            self.check_schema(schema, out, indent)
+        elif watch and schema_path:
+            module_str, schema_name = schema_path.rsplit(".", 1)
+            self.watch_schema(module_str, schema_name, out, indent)
+        elif watch:
             autoreload.run_with_reloader(
                 functools.partial(self.get_schema, schema, out, indent)
             )
@@ -0,0 +1,93 @@
+import importlib
+import sys
+import time
+
+import six
+from django.core.management.base import BaseCommand, CommandError
+
+from graphene_django.settings import graphene_settings
+from graphene_django.types import DjangoObjectType
+
+timer = getattr(time, "perf_counter", time.time)
+
+
+class Command(BaseCommand):
+    help = "Report the time spent building each DjangoObjectType of a schema"
+    can_import_settings = True
+    requires_system_checks = False
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--schema",
+            type=str,
+            dest="schema",
+            default=None,
+            help="Module path of the schema to profile, e.g. myproject.core.schema.schema",
+        )
+
+        parser.add_argument(
+            "--limit",
+            type=int,
+            dest="limit",
+            default=None,
+            help="Only report the N slowest types (default: all)",
+        )
+
+    def get_schema_path(self, options):
+        schema_path = options.get("schema")
+        if not schema_path:
+            schema_path = graphene_settings.user_settings.get("SCHEMA")
+
+        if not schema_path or not isinstance(schema_path, six.string_types):
+            raise CommandError(
+                "Specify schema on GRAPHENE.SCHEMA setting or by using --schema"
+            )
+        return schema_path
+
+    def profile_import(self, module_str):
+        timings = []
+        original = DjangoObjectType.__dict__["__init_subclass_with_meta__"]
+
+        def profiled(cls, **options):
+            start = timer()
+            try:
+                return original.__func__(cls, **options)
+            finally:
+                timings.append((cls, timer() - start))
+
+        DjangoObjectType.__init_subclass_with_meta__ = classmethod(profiled)
+        start = timer()
+        try:
+            importlib.import_module(module_str)
+        finally:
+            DjangoObjectType.__init_subclass_with_meta__ = original
+
+        return timings, timer() - start
+
+    def handle(self, *args, **options):
+        schema_path = self.get_schema_path(options)
+        module_str = schema_path.rsplit(".", 1)[0]
+
+        if module_str in sys.modules:
+            raise CommandError(
+                'The schema module "{}" was already imported while loading Django, '
+                "its types can't be profiled.".format(module_str)
+            )
+
+        timings, total = self.profile_import(module_str)
+        timings.sort(key=lambda timing: timing[1], reverse=True)
+
+        limit = options.get("limit")
+        for cls, duration in timings[:limit] if limit else timings:
+            self.stdout.write(
+                "{:>10.2f} ms  {} ({})".format(
+                    duration * 1000, cls.__name__, cls._meta.model._meta.label
+                )
+            )
+
+        types_total = sum(duration for _, duration in timings)
+        self.stdout.write(
+            "Built {} types in {:.2f} ms, {:.2f} ms importing {}".format(
+                len(timings), types_total * 1000, total * 1000, module_str
+            )
+        )
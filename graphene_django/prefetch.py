@@ -0,0 +1,136 @@
+"""
+Resolve relations prefetched with `prefetch_related` from the prefetched
+objects, applying the `get_queryset` filters of the types in Python.
+"""
+import operator
+
+from django.db.models import Model
+from django.db.models.expressions import Col
+from django.db.models.lookups import Lookup
+from django.db.models.query import ModelIterable, QuerySet
+from django.db.models.sql.where import AND, WhereNode
+
+# Lookups evaluated in Python, the others depend on the database (e.g. the
+# case sensitivity of `contains`) and are left to it
+LOOKUPS = {
+    "exact": operator.eq,
+    "in": lambda value, values: value in values,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "range": lambda value, bounds: bounds[0] <= value <= bounds[1],
+}
+
+
+def is_prefetched(queryset):
+    """
+    Whether `queryset` holds its model instances already, e.g. because it
+    was prefetched by `prefetch_related`.
+    """
+    return (
+        isinstance(queryset, QuerySet)
+        and queryset._result_cache is not None
+        and queryset._iterable_class is ModelIterable
+    )
+
+
+def get_query_state(query):
+    # Everything but the filters and the joins to fetch related objects
+    return (
+        query.low_mark,
+        query.high_mark,
+        query.distinct,
+        query.distinct_fields,
+        query.order_by,
+        query.extra_order_by,
+        query.default_ordering,
+        query.group_by,
+        query.combinator,
+        query.select,
+        query.values_select,
+        tuple(query.annotations),
+        tuple(query.extra),
+        tuple(query.alias_map),
+    )
+
+
+def compile_lookup(lookup, alias):
+    """
+    Return a function evaluating `lookup` on an instance with SQL semantics,
+    None being unknown, or None if it can't be evaluated in Python.
+    """
+    if isinstance(lookup, WhereNode):
+        predicates = [compile_lookup(child, alias) for child in lookup.children]
+        if None in predicates:
+            return None
+
+        def evaluate(instance):
+            results = [predicate(instance) for predicate in predicates]
+            decisive = lookup.connector != AND
+            if decisive in results:
+                result = decisive
+            elif None in results:
+                result = None
+            else:
+                result = not decisive
+            if lookup.negated and result is not None:
+                return not result
+            return result
+
+        return evaluate
+
+    if not (
+        isinstance(lookup, Lookup)
+        and isinstance(lookup.lhs, Col)
+        and lookup.lhs.alias == alias
+        and (lookup.lookup_name in LOOKUPS or lookup.lookup_name == "isnull")
+        and lookup.rhs_is_direct_value()
+        and not hasattr(lookup.rhs, "resolve_expression")
+    ):
+        return None
+
+    attname = lookup.lhs.target.attname
+    rhs = lookup.rhs.pk if isinstance(lookup.rhs, Model) else lookup.rhs
+    if lookup.lookup_name == "isnull":
+        return lambda instance: (getattr(instance, attname) is None) == rhs
+    compare = LOOKUPS[lookup.lookup_name]
+
+    def evaluate(instance):
+        value = getattr(instance, attname)
+        return None if value is None else compare(value, rhs)
+
+    return evaluate
+
+
+def filter_prefetched(prefetched, queryset):
+    """
+    Return the instances of the `prefetched` queryset kept by `queryset`, a
+    queryset derived from it, or None if `queryset` does more than filtering
+    on the columns of its model with simple lookups.
+    """
+    if queryset is prefetched:
+        return list(prefetched._result_cache)
+    if (
+        not isinstance(queryset, QuerySet)
+        or queryset.model is not prefetched.model
+        or queryset._iterable_class is not ModelIterable
+        or get_query_state(queryset.query) != get_query_state(prefetched.query)
+    ):
+        return None
+
+    where, prefetched_where = queryset.query.where, prefetched.query.where
+    if (
+        where.connector != AND
+        or where.negated
+        or prefetched_where.connector != AND
+        or prefetched_where.negated
+        or len(where.children) < len(prefetched_where.children)
+    ):
+        return None
+    # The filters are added after the ones of the prefetched queryset
+    filters = WhereNode(where.children[len(prefetched_where.children) :])
+    predicate = compile_lookup(filters, queryset.query.base_table)
+    if predicate is None:
+        return None
+    return [instance for instance in prefetched._result_cache if predicate(instance)]
@@ -2,6 +2,7 @@ class Registry(object):
     def __init__(self):
         self._registry = {}
         self._field_registry = {}
+        self._models_by_type_name = None
 
     def register(self, cls):
         from .types import DjangoObjectType
@@ -17,10 +18,18 @@ class Registry(object):
         # )
         if not getattr(cls._meta, "skip_registry", False):
             self._registry[cls._meta.model] = cls
+            self._models_by_type_name = None
 
     def get_type_for_model(self, model):
         return self._registry.get(model)
 
+    def get_model_for_type_name(self, name):
+        if self._models_by_type_name is None:
+            self._models_by_type_name = {
+                cls._meta.name: model for model, cls in self._registry.items()
+            }
+        return self._models_by_type_name.get(name)
+
     def register_converted_field(self, field, converted):
         self._field_registry[field] = converted
 
@@ -35,10 +35,23 @@ DEFAULTS = {
     "RELAY_CONNECTION_ENFORCE_FIRST_OR_LAST": False,
     # Max items returned in ConnectionFields / FilterConnectionFields
     "RELAY_CONNECTION_MAX_LIMIT": 100,
+    # How connection fields count their items: "exact", "estimated" or "capped"
+    "RELAY_CONNECTION_COUNT_STRATEGY": "exact",
+    # Number of items above which the "capped" count strategy stops counting
+    "RELAY_CONNECTION_COUNT_CAP": 1000,
     "CAMELCASE_ERRORS": False,
     # Set to True to enable v3 naming convention for choice field Enum's
     "DJANGO_CHOICE_FIELD_ENUM_V3_NAMING": False,
     "DJANGO_CHOICE_FIELD_ENUM_CUSTOM_NAME": None,
+    # Set to True to convert the model fields of DjangoObjectTypes only when
+    # the schema first needs them
+    "DJANGO_OBJECT_TYPE_LAZY_FIELDS": False,
+    # Set to True to load each model instance once per request, through an
+    # identity map used by get_node, foreign keys, list and connection fields
+    "DJANGO_OBJECT_TYPE_IDENTITY_MAP": False,
+    # Number of values above which `in` filters pass their values as a single
+    # array parameter (None to disable)
+    "FILTER_ARRAY_IN_THRESHOLD": 1000,
     # Use a separate path for handling subscriptions.
     "SUBSCRIPTION_PATH": None,
     # By default GraphiQL headers editor tab is enabled, set to False to hide it
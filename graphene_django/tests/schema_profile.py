@@ -0,0 +1,29 @@
+import graphene
+
+from ..registry import Registry
+from ..types import DjangoObjectType
+from .models import Article, Reporter
+
+registry = Registry()
+
+
+class ReporterType(DjangoObjectType):
+    class Meta:
+        model = Reporter
+        registry = registry
+        fields = "__all__"
+
+
+class ArticleType(DjangoObjectType):
+    class Meta:
+        model = Article
+        registry = registry
+        fields = "__all__"
+
+
+class Query(graphene.ObjectType):
+    reporter = graphene.Field(ReporterType)
+    article = graphene.Field(ArticleType)
+
+
+schema = graphene.Schema(query=Query)
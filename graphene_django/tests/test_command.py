@@ -1,34 +1,35 @@
+import json
 from textwrap import dedent
 
+import pytest
 from django.core import management
+from django.core.management.base import CommandError
 from mock import mock_open, patch
 from six import StringIO
 
 from graphene import ObjectType, Schema, String
 
 
-@patch("graphene_django.management.commands.graphql_schema.Command.save_json_file")
-def test_generate_json_file_on_call_graphql_schema(savefile_mock):
+def test_generate_json_file_on_call_graphql_schema():
     out = StringIO()
-    management.call_command("graphql_schema", schema="", stdout=out)
+    open_mock = mock_open()
+    with patch("graphene_django.management.commands.graphql_schema.open", open_mock):
+        management.call_command("graphql_schema", schema="", stdout=out)
+    open_mock.assert_called_once_with("schema.json", "w")
     assert "Successfully dumped GraphQL schema to schema.json" in out.getvalue()
 
 
-@patch("json.dump")
-def test_json_files_are_canonical(dump_mock):
+def test_json_files_are_canonical():
     open_mock = mock_open()
     with patch("graphene_django.management.commands.graphql_schema.open", open_mock):
         management.call_command("graphql_schema", schema="")
 
     open_mock.assert_called_once()
 
-    dump_mock.assert_called_once()
-    assert dump_mock.call_args[1][
-        "sort_keys"
-    ], "json.mock() should be used to sort the output"
-    assert (
-        dump_mock.call_args[1]["indent"] > 0
-    ), "output should be pretty-printed by default"
+    schema_output = open_mock().write.call_args[0][0]
+    assert schema_output == json.dumps(
+        json.loads(schema_output), indent=2, sort_keys=True
+    ), "output should be sorted and pretty-printed by default"
 
 
 def test_generate_graphql_file_on_call_graphql_schema():
@@ -60,3 +61,138 @@ def test_generate_graphql_file_on_call_graphql_schema():
         }
     """
     )
+
+
+def test_graphql_schema_profile_reports_each_type():
+    out = StringIO()
+    management.call_command(
+        "graphql_schema_profile",
+        schema="graphene_django.tests.schema_profile.schema",
+        stdout=out,
+    )
+
+    output = out.getvalue()
+    assert "ReporterType (tests.Reporter)" in output
+    assert "ArticleType (tests.Article)" in output
+    assert "Built 2 types" in output
+
+
+def test_check_graphql_schema_file(tmpdir):
+    class Query(ObjectType):
+        hi = String()
+
+    mock_schema = Schema(query=Query)
+    out_file = tmpdir.join("schema.graphql")
+    out_file.write(str(mock_schema))
+
+    out = StringIO()
+    management.call_command(
+        "graphql_schema", schema=mock_schema, out=str(out_file), check=True, stdout=out
+    )
+    assert "is up to date" in out.getvalue()
+
+    out_file.write("type Query {\n  hello: String\n}\n")
+    out = StringIO()
+    with pytest.raises(CommandError, match="is out of date"):
+        management.call_command(
+            "graphql_schema",
+            schema=mock_schema,
+            out=str(out_file),
+            check=True,
+            stdout=out,
+        )
+    assert "+  hi: String" in out.getvalue()
+    assert out_file.read() == "type Query {\n  hello: String\n}\n"
+
+
+def test_watch_graphql_schema_reloads_schema_module(tmpdir, monkeypatch):
+    package = tmpdir.mkdir("watched_schema_app")
+    package.join("__init__.py").write("")
+    schema_file = package.join("schema.py")
+    schema_source = dedent(
+        """\
+        import graphene
+
+        class Query(graphene.ObjectType):
+            {}
+
+        schema = graphene.Schema(query=Query)
+        """
+    )
+    schema_file.write(schema_source.format("hi = graphene.String()"))
+    monkeypatch.syspath_prepend(str(tmpdir))
+    out_file = tmpdir.join("schema.graphql")
+
+    def sleep(interval):
+        if "bye" in out_file.read():
+            raise KeyboardInterrupt
+        schema_file.write(schema_source.format("bye = graphene.String()"))
+        schema_file.setmtime(schema_file.mtime() + 10)
+
+    with patch("time.sleep", sleep):
+        with pytest.raises(KeyboardInterrupt):
+            management.call_command(
+                "graphql_schema",
+                schema="watched_schema_app.schema.schema",
+                out=str(out_file),
+                watch=True,
+                stdout=StringIO(),
+            )
+
+    assert "bye: String" in out_file.read()
+    assert "hi: String" not in out_file.read()
+
+
+def test_graphql_index_advisor_reports_unindexed_filters():
+    pytest.importorskip("django_filters")
+
+    from graphene.relay import Node
+
+    from ..filter import DjangoFilterConnectionField
+    from ..registry import Registry
+    from ..types import DjangoObjectType
+    from .models import Article, Reporter
+
+    test_registry = Registry()
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            registry = test_registry
+            interfaces = (Node,)
+            fields = ("id", "first_name")
+            filter_fields = {"first_name": ["exact"], "id": ["exact"]}
+
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+            registry = test_registry
+            interfaces = (Node,)
+            fields = ("id", "headline")
+            filter_fields = {
+                "headline": ["exact", "icontains"],
+                "reporter": ["exact"],
+                "reporter__first_name": ["exact"],
+            }
+
+    class Query(ObjectType):
+        reporters = DjangoFilterConnectionField(ReporterType)
+        articles = DjangoFilterConnectionField(ArticleType)
+
+    out = StringIO()
+    management.call_command(
+        "graphql_index_advisor", schema=Schema(query=Query), stdout=out
+    )
+    assert out.getvalue() == dedent(
+        """\
+        ArticleType (tests.Article)
+          filter headline: no index on tests_article.headline
+          filter headline__icontains: B-tree indexes can't be used for `icontains`, consider a trigram index or a SearchFilter
+          filter reporter__first_name: no index on tests_reporter.first_name
+          ordering headline: no index on tests_article.headline
+          suggestion: models.Index(fields=['reporter', 'headline'])
+        ReporterType (tests.Reporter)
+          filter first_name: no index on tests_reporter.first_name
+        Checked 2 types
+        """
+    )
@@ -0,0 +1,234 @@
+import datetime
+import gc
+import weakref
+
+import pytest
+from graphql import get_default_backend
+
+import graphene
+from graphene.relay import Node
+
+from ..compiled import GraphQLCompiledBackend
+from ..fields import DjangoConnectionField, DjangoListField
+from ..types import DjangoObjectType
+from .models import Article, Pet, Reporter
+
+
+class ReporterType(DjangoObjectType):
+    class Meta:
+        model = Reporter
+        interfaces = (Node,)
+        fields = ("first_name", "last_name", "email", "articles", "a_choice")
+
+    initials = graphene.String(required=True)
+    fails = graphene.String()
+    fails_required = graphene.String(required=True)
+
+    def resolve_initials(self, info):
+        return self.first_name[:1] + self.last_name[:1]
+
+    def resolve_fails(self, info):
+        raise Exception("Nullable field failed")
+
+    def resolve_fails_required(self, info):
+        raise Exception("Required field failed")
+
+
+class ArticleType(DjangoObjectType):
+    class Meta:
+        model = Article
+        interfaces = (Node,)
+        fields = ("headline", "pub_date", "reporter", "lang")
+
+
+class PetType(DjangoObjectType):
+    class Meta:
+        model = Pet
+        fields = ("name", "age")
+
+
+class SearchResult(graphene.Union):
+    class Meta:
+        types = (ReporterType, PetType)
+
+
+class Query(graphene.ObjectType):
+    node = Node.Field()
+    reporters = DjangoListField(ReporterType)
+    all_articles = DjangoConnectionField(ArticleType)
+    search = graphene.List(SearchResult, name=graphene.String(required=True))
+    greet = graphene.String(name=graphene.String(default_value="World"))
+    required_null = graphene.String(required=True)
+
+    def resolve_search(root, info, name):
+        return list(Reporter.objects.filter(first_name=name)) + list(
+            Pet.objects.filter(name=name)
+        )
+
+    def resolve_greet(root, info, name):
+        return "Hello {}".format(name)
+
+    def resolve_required_null(root, info):
+        return None
+
+
+class CreatePet(graphene.Mutation):
+    class Arguments:
+        name = graphene.String(required=True)
+
+    pet = graphene.Field(PetType)
+
+    def mutate(root, info, name):
+        return CreatePet(pet=Pet.objects.create(name=name, age=1))
+
+
+class Mutation(graphene.ObjectType):
+    create_pet = CreatePet.Field()
+
+
+schema = graphene.Schema(query=Query, mutation=Mutation)
+
+
+@pytest.fixture
+def data():
+    john = Reporter.objects.create(first_name="John", last_name="Doe", email="j@a.com")
+    jane = Reporter.objects.create(first_name="Jane", last_name="Roe", email="j@b.com")
+    for headline, reporter in [("A", john), ("B", jane), ("C", john)]:
+        Article.objects.create(
+            headline=headline,
+            pub_date=datetime.date(2020, 1, 1),
+            reporter=reporter,
+            editor=reporter,
+        )
+    Pet.objects.create(name="John", age=3)
+    return john, jane
+
+
+def execute(backend, query, **options):
+    document = backend.document_from_string(schema, query)
+    return document.execute(**options).to_dict()
+
+
+QUERIES = [
+    # Scalars, lists, aliases and arguments
+    ('{ greet hi: greet(name: "you") reporters { firstName initials } }', {}),
+    # Connections, relations and enums
+    (
+        """
+        {
+            allArticles(first: 2, after: "YXJyYXljb25uZWN0aW9uOjA=") {
+                pageInfo { hasNextPage hasPreviousPage }
+                edges { cursor node { id headline pubDate lang reporter { email } } }
+            }
+        }
+        """,
+        {},
+    ),
+    # Fragments and variables
+    (
+        """
+        query Reporters($last: Int) {
+            reporters { ...Names articles(first: 1) { edges { node { headline } } } }
+            allArticles(last: $last) { edges { node { ... on ArticleType { headline } } } }
+        }
+        fragment Names on ReporterType { firstName lastName aChoice }
+        """,
+        {"variable_values": {"last": 1}},
+    ),
+    # Directives
+    (
+        """
+        query ($withEmail: Boolean!, $skipNames: Boolean!) {
+            reporters {
+                email @include(if: $withEmail)
+                firstName @skip(if: $skipNames)
+            }
+        }
+        """,
+        {"variable_values": {"withEmail": True, "skipNames": False}},
+    ),
+    (
+        """
+        query ($withEmail: Boolean!, $skipNames: Boolean!) {
+            reporters {
+                email @include(if: $withEmail)
+                firstName @skip(if: $skipNames)
+            }
+        }
+        """,
+        {"variable_values": {"withEmail": False, "skipNames": True}},
+    ),
+    # Interfaces and unions
+    (
+        """
+        query ($id: ID!) {
+            node(id: $id) { __typename id ... on ReporterType { firstName } }
+            search(name: "John") {
+                __typename
+                ... on ReporterType { lastName }
+                ... on PetType { age }
+            }
+        }
+        """,
+        {"variable_values": {"id": "UmVwb3J0ZXJUeXBlOjE="}},
+    ),
+    # Errors on nullable and non-null fields
+    ("{ reporters { firstName fails } }", {}),
+    ("{ reporters { firstName failsRequired } }", {}),
+    ("{ greet requiredNull }", {}),
+    # Invalid documents and operations
+    ("{ unknown }", {}),
+    ("query A { greet } query B { greet }", {"operation_name": "B"}),
+    # Introspection
+    ("{ __schema { queryType { name } types { name kind } } }", {}),
+    # Mutations
+    (
+        'mutation { first: createPet(name: "Rex") { pet { name } } '
+        'second: createPet(name: "Fido") { pet { name age } } }',
+        {},
+    ),
+]
+
+
+@pytest.mark.parametrize("query,options", QUERIES)
+def test_compiled_backend_conforms_to_default_backend(data, query, options):
+    expected = execute(get_default_backend(), query, **options)
+    assert expected.get("data") or expected.get("errors")
+    compiled_backend = GraphQLCompiledBackend()
+    # Twice to run the execution plan compiled by the first execution
+    assert execute(compiled_backend, query, **options) == expected
+    assert execute(compiled_backend, query, **options) == expected
+
+
+def test_compiled_backend_reuses_documents_and_plans(data):
+    backend = GraphQLCompiledBackend(max_documents=1)
+    query = "query ($name: String) { greet(name: $name) }"
+    document = backend.document_from_string(schema, query)
+    assert backend.document_from_string(schema, query) is document
+
+    assert document.execute(variable_values={"name": "a"}).data == {"greet": "Hello a"}
+    assert document.execute(variable_values={"name": "b"}).data == {"greet": "Hello b"}
+    assert len(document.plans) == 1
+
+    backend.document_from_string(schema, "{ greet }")
+    assert backend.document_from_string(schema, query) is not document
+
+
+def test_compiled_backend_plans_do_not_keep_executions_alive(data):
+    class Context(object):
+        pass
+
+    backend = GraphQLCompiledBackend()
+    query = (
+        "{ reporters { firstName articles(first: 1) { edges { node { headline } } } } }"
+    )
+    document = backend.document_from_string(schema, query)
+    context = Context()
+    first = document.execute(context_value=context)
+    assert not first.errors
+    context_ref = weakref.ref(context)
+    del context
+    gc.collect()
+    assert context_ref() is None
+
+    assert document.execute(context_value=Context()).data == first.data
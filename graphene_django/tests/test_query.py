@@ -6,6 +6,8 @@ from django.db import models
 from django.db.models import Q
 from django.utils.functional import SimpleLazyObject
 from graphql_relay import to_global_id
+from mock import patch
+from graphql_relay.connection.arrayconnection import offset_to_cursor
 from py.test import raises
 
 import graphene
@@ -1617,3 +1619,1093 @@ def test_should_query_nullable_foreign_key():
         "pets": [{"name": "Jane's dog"}],
     }
     # assert False
+
+
+def test_connection_should_compute_aggregates_in_one_query(django_assert_num_queries,):
+    from django.db.models import Avg, Count, Max, Sum
+
+    reporter_1 = Reporter.objects.create(first_name="John", last_name="Doe")
+    reporter_2 = Reporter.objects.create(first_name="Jane", last_name="Doe")
+    for headline, reporter, importance, lang in [
+        ("A", reporter_1, 1, "es"),
+        ("B", reporter_1, 2, "es"),
+        ("C", reporter_2, 2, "es"),
+        ("D", reporter_2, 1, "en"),
+    ]:
+        Article.objects.create(
+            headline=headline,
+            pub_date=datetime.date.today(),
+            pub_date_time=datetime.datetime.now(),
+            reporter=reporter,
+            editor=reporter,
+            importance=importance,
+            lang=lang,
+        )
+
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+            interfaces = (Node,)
+            fields = ("headline",)
+
+    class Query(graphene.ObjectType):
+        spanish_articles = DjangoConnectionField(
+            ArticleType,
+            aggregates={
+                "sum_importance": Sum("importance"),
+                "avg_importance": Avg("importance"),
+                "count_distinct_reporter": Count("reporter", distinct=True),
+            },
+        )
+
+        all_articles = DjangoConnectionField(
+            ArticleType,
+            aggregates={"max_importance": Max("importance")},
+            aggregates_name="ArticleImportance",
+        )
+
+        def resolve_spanish_articles(self, info, **args):
+            return Article.objects.filter(lang="es")
+
+    schema = graphene.Schema(query=Query)
+    assert schema.get_type("ArticleImportance").fields.keys() == {
+        "maxImportance",
+        "count",
+    }
+    query = """
+        query {
+            spanishArticles(first: 1) {
+                edges {
+                    node {
+                        headline
+                    }
+                }
+                aggregates {
+                    sumImportance
+                    ... on ArticleTypeAggregates {
+                        countDistinctReporter
+                    }
+                    count
+                }
+            }
+        }
+    """
+
+    # aggregates with the count of the connection, then the page
+    with django_assert_num_queries(2) as captured:
+        result = schema.execute(query)
+    assert not result.errors
+    assert result.data == {
+        "spanishArticles": {
+            "edges": [{"node": {"headline": "A"}}],
+            "aggregates": {"sumImportance": 5, "countDistinctReporter": 2, "count": 3},
+        }
+    }
+    assert "AVG" not in captured.captured_queries[0]["sql"]
+
+
+def test_connection_should_count_with_capped_strategy(django_assert_num_queries):
+    for name in ["A", "B", "C", "D", "E"]:
+        Reporter.objects.create(first_name=name, last_name="Doe")
+
+    class CountedConnection(graphene.Connection):
+        class Meta:
+            abstract = True
+
+        total_count = graphene.Int()
+        total_count_is_exact = graphene.Boolean()
+
+        def resolve_total_count(self, info):
+            return self.length
+
+        def resolve_total_count_is_exact(self, info):
+            return self.length_is_exact
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            fields = ("first_name",)
+            connection_class = CountedConnection
+
+    class Query(graphene.ObjectType):
+        all_reporters = DjangoConnectionField(
+            ReporterType, count_strategy="capped", count_cap=3
+        )
+
+    schema = graphene.Schema(query=Query)
+    query = """
+        query ($first: Int, $after: String) {
+            allReporters(first: $first, after: $after) {
+                edges {
+                    node {
+                        firstName
+                    }
+                }
+                pageInfo {
+                    hasNextPage
+                }
+                totalCount
+                totalCountIsExact
+            }
+        }
+    """
+
+    # The page, then the count of at most 4 reporters
+    with django_assert_num_queries(2) as captured:
+        result = schema.execute(query, variables={"first": 2})
+    assert not result.errors
+    assert "LIMIT 4" in captured.captured_queries[1]["sql"]
+    assert result.data["allReporters"] == {
+        "edges": [{"node": {"firstName": "A"}}, {"node": {"firstName": "B"}}],
+        "pageInfo": {"hasNextPage": True},
+        "totalCount": 3,
+        "totalCountIsExact": False,
+    }
+
+    # The count isn't below the items known to exist
+    result = schema.execute(query, variables={"first": 1, "after": offset_to_cursor(1)})
+    assert not result.errors
+    assert result.data["allReporters"] == {
+        "edges": [{"node": {"firstName": "C"}}],
+        "pageInfo": {"hasNextPage": True},
+        "totalCount": 4,
+        "totalCountIsExact": False,
+    }
+
+    # The last page gives the exact count
+    with django_assert_num_queries(1):
+        result = schema.execute(
+            query, variables={"first": 2, "after": offset_to_cursor(2)}
+        )
+    assert not result.errors
+    assert result.data["allReporters"] == {
+        "edges": [{"node": {"firstName": "D"}}, {"node": {"firstName": "E"}}],
+        "pageInfo": {"hasNextPage": False},
+        "totalCount": 5,
+        "totalCountIsExact": True,
+    }
+
+    # SQLite has no row estimates
+    from ..counting import count_queryset
+
+    assert count_queryset(Reporter.objects.all(), "estimated") == (5, True)
+
+
+def test_connection_resolver_should_keep_its_positional_arguments(
+    django_assert_num_queries,
+):
+    for name in ["A", "B", "C"]:
+        Reporter.objects.create(first_name=name, last_name="Doe")
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            fields = ("first_name",)
+
+    class CustomConnectionField(DjangoConnectionField):
+        @classmethod
+        def connection_resolver(
+            cls,
+            resolver,
+            connection,
+            default_manager,
+            queryset_resolver,
+            max_limit,
+            enforce_first_or_last,
+            root,
+            info,
+            **args
+        ):
+            return super(CustomConnectionField, cls).connection_resolver(
+                resolver,
+                connection,
+                default_manager,
+                queryset_resolver,
+                max_limit,
+                enforce_first_or_last,
+                root,
+                info,
+                **args
+            )
+
+    class Query(graphene.ObjectType):
+        all_reporters = CustomConnectionField(ReporterType, count_strategy="window")
+
+    schema = graphene.Schema(query=Query)
+    query = """
+        query {
+            allReporters(first: 2) {
+                edges {
+                    node {
+                        firstName
+                    }
+                }
+            }
+        }
+    """
+
+    # The count strategy is still applied
+    with django_assert_num_queries(1):
+        result = schema.execute(query)
+    assert not result.errors
+    assert result.data["allReporters"] == {
+        "edges": [{"node": {"firstName": "A"}}, {"node": {"firstName": "B"}}]
+    }
+
+
+def test_connection_should_count_with_window_strategy(django_assert_num_queries):
+    for name in ["A", "B", "C"]:
+        Reporter.objects.create(first_name=name, last_name="Doe")
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            fields = ("first_name",)
+
+    class Query(graphene.ObjectType):
+        all_reporters = DjangoConnectionField(ReporterType, count_strategy="window")
+
+    schema = graphene.Schema(query=Query)
+    query = """
+        query ($after: String) {
+            allReporters(first: 2, after: $after) {
+                edges {
+                    node {
+                        firstName
+                    }
+                }
+                pageInfo {
+                    hasNextPage
+                }
+            }
+        }
+    """
+
+    with django_assert_num_queries(1) as captured:
+        result = schema.execute(query)
+    assert not result.errors
+    assert "OVER ()" in captured.captured_queries[0]["sql"]
+    assert result.data["allReporters"] == {
+        "edges": [{"node": {"firstName": "A"}}, {"node": {"firstName": "B"}}],
+        "pageInfo": {"hasNextPage": True},
+    }
+
+    # An empty page falls back to counting
+    with django_assert_num_queries(2):
+        result = schema.execute(query, variables={"after": offset_to_cursor(4)})
+    assert not result.errors
+    assert result.data["allReporters"] == {
+        "edges": [],
+        "pageInfo": {"hasNextPage": False},
+    }
+
+
+def test_connection_should_fetch_last_items_in_reverse_order(
+    django_assert_num_queries,
+):
+    reporter = Reporter.objects.create(first_name="John", last_name="Doe")
+    for headline in ["E", "A", "D", "B", "C"]:
+        Article.objects.create(
+            headline=headline,
+            pub_date=datetime.date.today(),
+            pub_date_time=datetime.datetime.now(),
+            reporter=reporter,
+            editor=reporter,
+        )
+
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+            interfaces = (Node,)
+            fields = ("headline",)
+
+    class Query(graphene.ObjectType):
+        all_articles = DjangoConnectionField(ArticleType)
+
+        def resolve_all_articles(self, info, **args):
+            # Ends with the primary key, leaving no ties to reverse
+            return Article.objects.order_by("headline", "pk")
+
+    schema = graphene.Schema(query=Query)
+    query = """
+        query ($before: String) {
+            allArticles(last: 2, before: $before) {
+                edges {
+                    cursor
+                    node {
+                        headline
+                    }
+                }
+                pageInfo {
+                    hasPreviousPage
+                }
+            }
+        }
+    """
+
+    with django_assert_num_queries(2) as captured:
+        result = schema.execute(query)
+    assert not result.errors
+    assert "DESC LIMIT 2" in captured.captured_queries[1]["sql"]
+    assert result.data["allArticles"] == {
+        "edges": [
+            {"cursor": offset_to_cursor(3), "node": {"headline": "D"}},
+            {"cursor": offset_to_cursor(4), "node": {"headline": "E"}},
+        ],
+        "pageInfo": {"hasPreviousPage": True},
+    }
+
+    result = schema.execute(query, variables={"before": offset_to_cursor(1)})
+    assert not result.errors
+    assert result.data["allArticles"] == {
+        "edges": [{"cursor": offset_to_cursor(0), "node": {"headline": "A"}}],
+        "pageInfo": {"hasPreviousPage": False},
+    }
+
+
+def test_connection_should_fetch_last_items_in_order_with_tied_ordering_keys(
+    django_assert_num_queries,
+):
+    reporter = Reporter.objects.create(first_name="John", last_name="Doe")
+    for _ in range(5):
+        Article.objects.create(
+            headline="A",
+            pub_date=datetime.date.today(),
+            pub_date_time=datetime.datetime.now(),
+            reporter=reporter,
+            editor=reporter,
+        )
+
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+            interfaces = (Node,)
+            fields = ("headline",)
+
+    class Query(graphene.ObjectType):
+        all_articles = DjangoConnectionField(ArticleType)
+
+    schema = graphene.Schema(query=Query)
+    query = """
+        query ($first: Int, $last: Int) {
+            allArticles(first: $first, last: $last) {
+                edges {
+                    cursor
+                    node {
+                        id
+                    }
+                }
+            }
+        }
+    """
+
+    result = schema.execute(query, variables={"first": 5})
+    assert not result.errors
+    edges = result.data["allArticles"]["edges"]
+
+    # The articles ordered by headline only can't be fetched in reverse order
+    with django_assert_num_queries(2) as captured:
+        result = schema.execute(query, variables={"last": 2})
+    assert not result.errors
+    assert "DESC" not in captured.captured_queries[1]["sql"]
+    assert result.data["allArticles"]["edges"] == edges[3:]
+
+
+def test_nodes_field_should_fetch_nodes_per_type(django_assert_num_queries):
+    from ..fields import DjangoNodesField
+
+    john = Reporter.objects.create(first_name="John", last_name="Doe")
+    jane = Reporter.objects.create(first_name="Jane", last_name="Doe")
+    hidden = Reporter.objects.create(first_name="Hidden", last_name="Doe")
+    article = Article.objects.create(
+        headline="A",
+        pub_date=datetime.date.today(),
+        pub_date_time=datetime.datetime.now(),
+        reporter=john,
+        editor=john,
+    )
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            fields = ("first_name",)
+
+        @classmethod
+        def get_queryset(cls, queryset, info):
+            return queryset.exclude(first_name="Hidden")
+
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+            interfaces = (Node,)
+            fields = ("headline",)
+
+    class Query(graphene.ObjectType):
+        nodes = DjangoNodesField()
+        reporter = graphene.Field(ReporterType)
+        article = graphene.Field(ArticleType)
+
+    schema = graphene.Schema(query=Query)
+    query = """
+        query ($ids: [ID!]!) {
+            nodes(ids: $ids) {
+                ... on ReporterType {
+                    firstName
+                }
+                ... on ArticleType {
+                    headline
+                }
+            }
+        }
+    """
+    ids = [
+        to_global_id("ReporterType", jane.pk),
+        to_global_id("ArticleType", article.pk),
+        to_global_id("ReporterType", hidden.pk),
+        to_global_id("ReporterType", 1000),
+        to_global_id("ReporterType", "not a pk"),
+        "invalid",
+        to_global_id("ReporterType", john.pk),
+    ]
+
+    with django_assert_num_queries(2):
+        result = schema.execute(query, variables={"ids": ids})
+    assert not result.errors
+    assert result.data["nodes"] == [
+        {"firstName": "Jane"},
+        {"headline": "A"},
+        None,
+        None,
+        None,
+        None,
+        {"firstName": "John"},
+    ]
+
+
+def test_identity_map_should_load_instances_once(django_assert_num_queries):
+    from ..fields import DjangoListField
+
+    john = Reporter.objects.create(first_name="John", last_name="Doe")
+    jane = Reporter.objects.create(first_name="Jane", last_name="Doe")
+    for headline, reporter in [("A", john), ("B", jane), ("C", john)]:
+        Article.objects.create(
+            headline=headline,
+            pub_date=datetime.date.today(),
+            pub_date_time=datetime.datetime.now(),
+            reporter=reporter,
+            editor=reporter,
+        )
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            fields = ("first_name",)
+
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+            fields = ("headline", "reporter")
+
+    class Query(graphene.ObjectType):
+        reporters = DjangoListField(ReporterType)
+        articles = DjangoListField(ArticleType)
+        node = Node.Field()
+
+    class Context(object):
+        pass
+
+    schema = graphene.Schema(query=Query)
+    query = """
+        query ($id: ID!) {
+            reporters {
+                firstName
+            }
+            articles {
+                headline
+                reporter {
+                    firstName
+                }
+            }
+            node(id: $id) {
+                ... on ReporterType {
+                    firstName
+                }
+            }
+        }
+    """
+    variables = {"id": to_global_id("ReporterType", jane.pk)}
+
+    context = Context()
+    with django_assert_num_queries(2), patch(
+        "graphene_django.settings.graphene_settings.DJANGO_OBJECT_TYPE_IDENTITY_MAP",
+        True,
+    ):
+        result = schema.execute(query, variables=variables, context_value=context)
+    assert not result.errors
+    assert [
+        article["reporter"]["firstName"] for article in result.data["articles"]
+    ] == ["John", "Jane", "John",]
+    assert result.data["node"] == {"firstName": "Jane"}
+    identity_map = context._graphene_identity_map
+    assert identity_map.get(Reporter, str(john.pk)) is identity_map.get(
+        Reporter, john.pk
+    )
+
+    # Without it each reporter is loaded twice per article
+    with django_assert_num_queries(9):
+        result = schema.execute(query, variables=variables, context_value=Context())
+    assert not result.errors
+
+
+@patch(
+    "graphene_django.settings.graphene_settings.DJANGO_OBJECT_TYPE_IDENTITY_MAP", True
+)
+def test_identity_map_can_be_disabled_per_type():
+    from ..identity_map import get_identity_map
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            fields = ("first_name",)
+            identity_map = False
+
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+            fields = ("headline",)
+
+    class Info(object):
+        context = {}
+
+    info = Info()
+    assert get_identity_map(info, ReporterType) is None
+    assert get_identity_map(info, ArticleType) is info.context["_graphene_identity_map"]
+
+
+def test_cache_should_serve_nodes_until_the_model_changes(django_assert_num_queries):
+    from django.core.cache import cache
+
+    cache.clear()
+    john = Reporter.objects.create(first_name="John", last_name="Doe", email="j@a.com")
+    jane = Reporter.objects.create(first_name="Jane", last_name="Doe", email="j@b.com")
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            fields = ("first_name",)
+            cache = {"ttl": 60, "vary": lambda info: info.context.get("user", "")}
+
+        @classmethod
+        def get_queryset(cls, queryset, info):
+            if info.context.get("user") != "admin":
+                return queryset.filter(email__endswith="a.com")
+            return queryset
+
+    class Query(graphene.ObjectType):
+        node = Node.Field()
+
+    schema = graphene.Schema(query=Query, types=[ReporterType])
+    query = """
+        query ($id: ID!) {
+            node(id: $id) {
+                ... on ReporterType {
+                    firstName
+                }
+            }
+        }
+    """
+
+    def execute(reporter, user=""):
+        result = schema.execute(
+            query,
+            variables={"id": to_global_id("ReporterType", reporter.pk)},
+            context_value={"user": user},
+        )
+        assert not result.errors
+        return result.data["node"]
+
+    node_cache = ReporterType._meta.cache
+    with django_assert_num_queries(1):
+        assert execute(john) == {"firstName": "John"}
+        assert execute(john) == {"firstName": "John"}
+    assert node_cache.get_stats() == {"hits": 1, "misses": 1}
+
+    # Not visible to anonymous users, only cached for admins
+    with django_assert_num_queries(2):
+        assert execute(jane) is None
+        assert execute(jane, user="admin") == {"firstName": "Jane"}
+    with django_assert_num_queries(1):
+        assert execute(jane, user="admin") == {"firstName": "Jane"}
+        assert execute(jane) is None
+
+    john.first_name = "Johnny"
+    john.save()
+    with django_assert_num_queries(1):
+        assert execute(john) == {"firstName": "Johnny"}
+
+    with django_assert_num_queries(1):
+        assert ReporterType.get_nodes(
+            type("Info", (), {"context": {"user": "admin"}}), [john.pk, jane.pk]
+        ) == [john, jane]
+    with django_assert_num_queries(0):
+        assert ReporterType.get_nodes(
+            type("Info", (), {"context": {"user": "admin"}}), [john.pk, jane.pk]
+        ) == [john, jane]
+
+
+def test_cache_should_vary_by_user_and_connect_receivers_once():
+    from django.db.models.signals import post_save
+
+    from ..cache import vary_by_user
+
+    def define_type():
+        class ReporterType(DjangoObjectType):
+            class Meta:
+                model = Reporter
+                interfaces = (Node,)
+                fields = ("first_name",)
+                cache = {"ttl": 60}
+                skip_registry = True
+
+        return ReporterType
+
+    reporter_type = define_type()
+    receivers = len(post_save.receivers)
+    define_type()
+    assert len(post_save.receivers) == receivers
+    assert reporter_type._meta.cache.vary is vary_by_user
+
+    def info(user):
+        return type("Info", (), {"context": type("Request", (), {"user": user})})
+
+    user = type("User", (), {"pk": 1, "is_authenticated": True})
+    assert vary_by_user(info(user)) == "user-1"
+    anonymous = type("AnonymousUser", (), {"pk": None, "is_authenticated": False})
+    assert vary_by_user(info(anonymous)) == "anonymous"
+    assert vary_by_user(type("Info", (), {"context": None})) == ""
+
+
+def test_use_values_should_skip_model_instances_for_columns_only():
+    from ..fields import DjangoListField
+    from ..values import ValuesRow
+
+    r = Reporter.objects.create(first_name="John", last_name="Doe", email="j@a.com")
+    Article.objects.create(
+        headline="A",
+        pub_date=datetime.date.today(),
+        pub_date_time=datetime.datetime.now(),
+        reporter=r,
+        editor=r,
+    )
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            fields = ("first_name", "last_name", "email", "articles")
+
+        full_name = graphene.String()
+
+        def resolve_full_name(self, info):
+            assert not isinstance(self, ValuesRow)
+            return "{} {}".format(self.first_name, self.last_name)
+
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+            fields = ("headline",)
+
+    class Query(graphene.ObjectType):
+        reporters = DjangoListField(ReporterType, use_values=True)
+        all_reporters = DjangoConnectionField(ReporterType, use_values=True)
+
+        def resolve_reporters(root, info):
+            return Reporter.objects.all()
+
+    loaded = []
+    original_from_db = Reporter.from_db.__func__
+
+    def from_db(cls, *args):
+        loaded.append(cls)
+        return original_from_db(cls, *args)
+
+    schema = graphene.Schema(query=Query)
+    with patch.object(Reporter, "from_db", classmethod(from_db)):
+        result = schema.execute(
+            """
+            query {
+                reporters { id firstName ...Email }
+                allReporters { edges { node { id lastName } } }
+            }
+            fragment Email on ReporterType { email }
+            """
+        )
+    assert not result.errors
+    global_id = to_global_id("ReporterType", r.pk)
+    assert result.data == {
+        "reporters": [{"id": global_id, "firstName": "John", "email": "j@a.com"}],
+        "allReporters": {"edges": [{"node": {"id": global_id, "lastName": "Doe"}}]},
+    }
+    assert loaded == []
+
+    # Custom resolvers and relations need the model instances
+    with patch.object(Reporter, "from_db", classmethod(from_db)):
+        result = schema.execute(
+            """
+            query {
+                reporters { fullName }
+                allReporters { edges { node { articles { headline } } } }
+            }
+            """
+        )
+    assert not result.errors
+    assert result.data == {
+        "reporters": [{"fullName": "John Doe"}],
+        "allReporters": {"edges": [{"node": {"articles": [{"headline": "A"}]}}]},
+    }
+    assert loaded == [Reporter, Reporter]
+
+
+def test_json_pushdown_should_build_rows_in_the_database(django_assert_num_queries):
+    from ..fields import DjangoListField
+    from ..json_pushdown import supports_json_pushdown
+
+    if not supports_json_pushdown("default"):
+        pytest.skip("SQLite is built without JSON support")
+
+    john = Reporter.objects.create(first_name="John", last_name="Doe", email="j@a.com")
+    articles = [
+        Article.objects.create(
+            headline=headline,
+            pub_date=datetime.date.today(),
+            pub_date_time=datetime.datetime.now(),
+            reporter=john,
+            editor=john,
+            importance=importance,
+        )
+        for headline, importance in [("A", 1), ("B", None)]
+    ]
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            fields = ("first_name",)
+
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+            interfaces = (Node,)
+            fields = ("headline", "pub_date", "pub_date_time", "importance", "reporter")
+
+    class Query(graphene.ObjectType):
+        articles = DjangoListField(ArticleType, json_pushdown=True)
+        all_articles = DjangoConnectionField(
+            ArticleType, json_pushdown=True, count_strategy="window"
+        )
+
+    loaded = []
+
+    def counting(model):
+        original_from_db = model.from_db.__func__
+
+        def from_db(cls, *args):
+            loaded.append(cls)
+            return original_from_db(cls, *args)
+
+        return patch.object(model, "from_db", classmethod(from_db))
+
+    schema = graphene.Schema(query=Query)
+    query = """
+        query {
+            articles { id headline pubDate importance reporter { id firstName } }
+            allArticles(first: 1) {
+                edges { node { headline } }
+            }
+        }
+    """
+    with counting(Article), counting(Reporter), django_assert_num_queries(2):
+        result = schema.execute(query)
+    assert not result.errors
+    reporter = {"id": to_global_id("ReporterType", john.pk), "firstName": "John"}
+    assert result.data["articles"] == [
+        {
+            "id": to_global_id("ArticleType", articles[0].pk),
+            "headline": "A",
+            "pubDate": datetime.date.today().isoformat(),
+            "importance": "A_1",
+            "reporter": reporter,
+        },
+        {
+            "id": to_global_id("ArticleType", articles[1].pk),
+            "headline": "B",
+            "pubDate": datetime.date.today().isoformat(),
+            "importance": None,
+            "reporter": reporter,
+        },
+    ]
+    assert result.data["allArticles"] == {"edges": [{"node": {"headline": "A"}}]}
+    assert loaded == []
+
+    # Date times aren't read back from JSON
+    with counting(Article), counting(Reporter):
+        result = schema.execute("query { articles { pubDateTime } }")
+    assert not result.errors
+    assert loaded == [Article, Article]
+
+
+def test_annotated_field_should_annotate_when_selected(django_assert_num_queries):
+    from django.db.models import Count
+    from ..annotations import DjangoAnnotatedField
+    from ..fields import DjangoListField
+
+    john = Reporter.objects.create(first_name="John", last_name="Doe", email="j@a.com")
+    Reporter.objects.create(first_name="Jane", last_name="Roe", email="j@b.com")
+    for headline in ("A", "B"):
+        Article.objects.create(
+            headline=headline,
+            pub_date=datetime.date.today(),
+            pub_date_time=datetime.datetime.now(),
+            reporter=john,
+            editor=john,
+        )
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            fields = ("first_name",)
+
+        article_count = DjangoAnnotatedField(Count("articles"))
+
+    class Query(graphene.ObjectType):
+        reporters = DjangoListField(ReporterType)
+        all_reporters = DjangoConnectionField(ReporterType)
+        first_reporter = graphene.Field(ReporterType)
+
+        def resolve_reporters(root, info):
+            return Reporter.objects.order_by("pk")
+
+        def resolve_first_reporter(root, info):
+            return Reporter.objects.order_by("pk").first()
+
+    schema = graphene.Schema(query=Query)
+    assert str(schema.get_type("ReporterType").fields["articleCount"].type) == "Int"
+
+    with django_assert_num_queries(3) as captured:
+        result = schema.execute(
+            """
+            query {
+                reporters { firstName articleCount }
+                allReporters { edges { node { ...Count } } }
+            }
+            fragment Count on ReporterType { articleCount }
+            """
+        )
+    assert not result.errors
+    assert result.data == {
+        "reporters": [
+            {"firstName": "John", "articleCount": 2},
+            {"firstName": "Jane", "articleCount": 0},
+        ],
+        "allReporters": {
+            "edges": [{"node": {"articleCount": 2}}, {"node": {"articleCount": 0}}]
+        },
+    }
+    assert "COUNT" in captured.captured_queries[0]["sql"]
+
+    # Not selected, not annotated
+    with django_assert_num_queries(1) as captured:
+        result = schema.execute("query { reporters { firstName } }")
+    assert not result.errors
+    assert "COUNT" not in captured.captured_queries[0]["sql"]
+
+    # Objects from custom resolvers fall back on a query per object
+    with django_assert_num_queries(2):
+        result = schema.execute("query { firstReporter { articleCount } }")
+    assert not result.errors
+    assert result.data == {"firstReporter": {"articleCount": 2}}
+
+
+def test_annotated_field_should_annotate_nodes(django_assert_num_queries):
+    from django.core.cache import cache
+    from django.db.models import Count
+    from ..annotations import DjangoAnnotatedField
+    from ..fields import DjangoNodesField
+
+    cache.clear()
+    reporters = [
+        Reporter.objects.create(first_name=name, last_name="Doe", email="j@a.com")
+        for name in ("John", "Jane", "Jack")
+    ]
+
+    def add_article(reporter):
+        Article.objects.create(
+            headline="A",
+            pub_date=datetime.date.today(),
+            pub_date_time=datetime.datetime.now(),
+            reporter=reporter,
+            editor=reporter,
+        )
+
+    add_article(reporters[0])
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            fields = ("first_name",)
+
+        article_count = DjangoAnnotatedField(Count("articles"))
+
+    class CachedReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            interfaces = (Node,)
+            fields = ("first_name",)
+            cache = {"vary": None}
+            skip_registry = True
+
+        article_count = DjangoAnnotatedField(Count("articles"))
+
+    class Query(graphene.ObjectType):
+        node = Node.Field()
+        nodes = DjangoNodesField()
+
+    schema = graphene.Schema(query=Query, types=[ReporterType])
+    query = """
+        query ($id: ID!, $ids: [ID!]!) {
+            node(id: $id) { ... on ReporterType { articleCount } }
+            nodes(ids: $ids) { ... on ReporterType { articleCount } }
+        }
+    """
+    ids = [to_global_id("ReporterType", reporter.pk) for reporter in reporters]
+    with django_assert_num_queries(2):
+        result = schema.execute(query, variables={"id": ids[0], "ids": ids})
+    assert not result.errors
+    assert result.data == {
+        "node": {"articleCount": 1},
+        "nodes": [{"articleCount": 1}, {"articleCount": 0}, {"articleCount": 0}],
+    }
+
+    # The annotations aren't cached, as the articles don't invalidate the nodes
+    query = """
+        query ($id: ID!) {
+            node(id: $id) { ... on CachedReporterType { articleCount } }
+        }
+    """
+    schema = graphene.Schema(query=Query, types=[CachedReporterType])
+    variables = {"id": to_global_id("CachedReporterType", reporters[1].pk)}
+    result = schema.execute(query, variables=variables)
+    assert result.data == {"node": {"articleCount": 0}}
+    add_article(reporters[1])
+    with django_assert_num_queries(1):
+        result = schema.execute(query, variables=variables)
+    assert result.data == {"node": {"articleCount": 1}}
+
+
+def test_should_resolve_prefetched_relations_in_memory(django_assert_num_queries):
+    from ..fields import DjangoListField
+
+    john = Reporter.objects.create(first_name="John", last_name="Doe", email="j@a.com")
+    jane = Reporter.objects.create(first_name="Jane", last_name="Roe", email="j@b.com")
+    for headline, lang, reporter in [
+        ("A", "es", john),
+        ("B", "en", john),
+        ("C", "es", john),
+        ("D", "en", jane),
+    ]:
+        Article.objects.create(
+            headline=headline,
+            pub_date=datetime.date.today(),
+            pub_date_time=datetime.datetime.now(),
+            reporter=reporter,
+            editor=reporter,
+            lang=lang,
+        )
+
+    lookups = {"lang": "es"}
+
+    class ArticleType(DjangoObjectType):
+        class Meta:
+            model = Article
+            interfaces = (Node,)
+            fields = ("headline",)
+
+        @classmethod
+        def get_queryset(cls, queryset, info):
+            return queryset.filter(**lookups)
+
+    class ReporterType(DjangoObjectType):
+        class Meta:
+            model = Reporter
+            fields = ("first_name", "articles")
+
+        article_list = DjangoListField(ArticleType)
+
+        def resolve_article_list(self, info):
+            return self.articles
+
+    class Query(graphene.ObjectType):
+        reporters = graphene.List(ReporterType)
+
+        def resolve_reporters(root, info):
+            return Reporter.objects.prefetch_related("articles").order_by("pk")
+
+    schema = graphene.Schema(query=Query)
+    query = """
+        query {
+            reporters {
+                articleList { headline }
+                articles(first: 1) {
+                    edges { node { headline } }
+                    pageInfo { hasNextPage }
+                }
+            }
+        }
+    """
+    expected = {
+        "reporters": [
+            {
+                "articleList": [{"headline": "A"}, {"headline": "C"}],
+                "articles": {
+                    "edges": [{"node": {"headline": "A"}}],
+                    "pageInfo": {"hasNextPage": True},
+                },
+            },
+            {
+                "articleList": [],
+                "articles": {"edges": [], "pageInfo": {"hasNextPage": False}},
+            },
+        ]
+    }
+    with django_assert_num_queries(2):
+        result = schema.execute(query)
+    assert not result.errors
+    assert result.data == expected
+
+    # Lookups depending on the database are left to it
+    lookups = {"lang__iexact": "ES"}
+    # The lists, the counts of the connections and the non-empty pages
+    with django_assert_num_queries(2 + 2 + 2 + 1):
+        result = schema.execute(query)
+    assert not result.errors
+    assert result.data == expected
+
+    # Unless the type filters the prefetched objects itself
+    def resolve_prefetched(cls, queryset, info):
+        return [article for article in queryset if article.lang == "es"]
+
+    with patch.object(
+        ArticleType, "resolve_prefetched", classmethod(resolve_prefetched)
+    ):
+        with django_assert_num_queries(2):
+            result = schema.execute(query)
+    assert not result.errors
+    assert result.data == expected
@@ -606,3 +606,104 @@ def test_django_objecttype_name_connection_propagation():
     assert "type Reporter implements Node {" not in schema
     assert "type ReporterConnection {" not in schema
     assert "type ReporterEdge {" not in schema
+
+
+@with_local_registry
+def test_django_objecttype_lazy_fields():
+    with patch("graphene_django.types.construct_fields") as construct_fields_mock:
+        construct_fields_mock.return_value = OrderedDict()
+
+        class Reporter(DjangoObjectType):
+            custom_field = String()
+
+            class Meta:
+                model = ReporterModel
+                fields = ("first_name", "custom_field")
+                lazy_fields = True
+
+        construct_fields_mock.assert_not_called()
+        assert not Reporter._meta.fields.built
+
+    class Query(ObjectType):
+        reporter = Field(Reporter)
+
+    schema = Schema(query=Query)
+    assert Reporter._meta.fields.built
+    assert list(Reporter._meta.fields) == ["first_name", "custom_field"]
+    assert str(schema) == dedent(
+        """\
+    schema {
+      query: Query
+    }
+
+    type Query {
+      reporter: Reporter
+    }
+
+    type Reporter {
+      firstName: String!
+      customField: String
+    }
+    """
+    )
+
+
+@with_local_registry
+def test_django_objecttype_lazy_fields_are_validated_when_built():
+    class Reporter(DjangoObjectType):
+        class Meta:
+            model = ReporterModel
+            fields = ["first_name", "foo"]
+            lazy_fields = True
+
+    with pytest.warns(UserWarning, match=r"Field name .* doesn't exist"):
+        Reporter._meta.fields.get_fields()
+
+
+@with_local_registry
+def test_django_objecttype_lazy_fields_setting():
+    with patch(
+        "graphene_django.types.graphene_settings.DJANGO_OBJECT_TYPE_LAZY_FIELDS", True
+    ):
+
+        class Reporter(DjangoObjectType):
+            class Meta:
+                model = ReporterModel
+                fields = ("first_name",)
+
+    assert not Reporter._meta.fields.built
+    assert list(Reporter._meta.fields) == ["first_name"]
+
+
+@with_local_registry
+def test_django_objecttype_is_type_of_checks_classes_once():
+    from .models import CNNReporter
+
+    class Reporter(DjangoObjectType):
+        class Meta:
+            model = ReporterModel
+
+    class CNNReporterType(DjangoObjectType):
+        class Meta:
+            model = CNNReporter
+
+    with patch(
+        "graphene_django.types.is_valid_django_model", return_value=True
+    ) as is_valid_django_model:
+        for _ in range(3):
+            assert Reporter.is_type_of(ReporterModel(), None)
+            assert Reporter.is_type_of(CNNReporter(), None)
+            assert not CNNReporterType.is_type_of(ReporterModel(), None)
+            assert CNNReporterType.is_type_of(CNNReporter(), None)
+            assert not Reporter.is_type_of(ArticleModel(), None)
+
+    # Reporter and CNNReporter are known to their own types
+    assert is_valid_django_model.call_count == 3
+    assert Reporter._meta.compatible_classes == {
+        ReporterModel: True,
+        CNNReporter: True,
+        ArticleModel: False,
+    }
+
+    with pytest.raises(Exception, match="Received incompatible instance"):
+        Reporter.is_type_of(object(), None)
@@ -4,11 +4,23 @@ import pytest
 from django.utils.translation import gettext_lazy
 from mock import patch
 
-from ..utils import camelize, get_model_fields, GraphQLTestCase
+from ..utils import camelize, from_global_ids, get_model_fields, GraphQLTestCase
 from .models import Film, Reporter
 from ..utils.testing import graphql_query
 
 
+def test_from_global_ids():
+    assert from_global_ids(["UmVwb3J0ZXI6MQ==", "QXJ0aWNsZTphOmI="]) == [
+        ("Reporter", "1"),
+        ("Article", "a:b"),
+    ]
+
+    for invalid in ["UmVwb3J0ZXI6M", "UmVwb3J0ZXI=", "OjE=", None]:
+        with pytest.raises(ValueError) as excinfo:
+            from_global_ids(["UmVwb3J0ZXI6MQ==", invalid])
+        assert excinfo.value.args == (invalid,)
+
+
 def test_get_model_fields_no_duplication():
     reporter_fields = get_model_fields(Reporter)
     reporter_name_set = set([field[0] for field in reporter_fields])
@@ -19,6 +31,16 @@ def test_get_model_fields_no_duplication():
     assert len(film_fields) == len(film_name_set)
 
 
+def test_get_model_fields_is_cached_per_model():
+    reporter_fields = get_model_fields(Reporter)
+    reporter_fields.pop()
+
+    assert get_model_fields(Reporter) == reporter_fields + [
+        get_model_fields(Reporter)[-1]
+    ]
+    assert get_model_fields(Reporter)[0][1] is reporter_fields[0][1]
+
+
 def test_camelize():
     assert camelize({}) == {}
     assert camelize("value_a") == "value_a"
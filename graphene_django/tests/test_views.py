@@ -828,3 +828,88 @@ def test_query_errors_atomic_request(set_rollback_mock, client):
 def test_query_errors_non_atomic(set_rollback_mock, client):
     client.get(url_string(query="force error"))
     set_rollback_mock.assert_not_called()
+
+
+def test_middleware_manager_is_shared_between_views():
+    from ..views import GraphQLView
+    from .schema_view import schema
+
+    class CountingMiddleware(object):
+        instances = 0
+
+        def __init__(self):
+            CountingMiddleware.instances += 1
+
+        def resolve(self, next, root, info, **args):
+            return next(root, info, **args)
+
+    view_1 = GraphQLView(schema=schema, middleware=[CountingMiddleware])
+    view_2 = GraphQLView(schema=schema, middleware=[CountingMiddleware])
+
+    assert view_1.middleware is view_2.middleware
+    assert CountingMiddleware.instances == 1
+
+    resolver = lambda root, info: None
+    assert view_1.middleware.get_field_resolver(
+        resolver
+    ) is view_2.middleware.get_field_resolver(resolver)
+
+
+def test_empty_middleware_is_not_wrapped():
+    from ..views import GraphQLView
+    from .schema_view import schema
+
+    assert GraphQLView(schema=schema, middleware=[]).middleware is None
+
+
+def test_introspection_query_is_served_from_cache(rf):
+    from graphql.utils.introspection_query import introspection_query
+
+    from ..introspection import clear_introspection_results
+    from ..views import GraphQLView
+    from .schema_view import schema
+
+    clear_introspection_results()
+    view = GraphQLView.as_view(schema=schema, introspection_cache=True)
+    # Reformatting the query doesn't prevent it from being recognized
+    query = " ".join(introspection_query.split()).replace("{ ", "{")
+
+    with patch("graphene_django.views.GraphQLView.execute_graphql_request") as mock:
+        response = view(rf.post("/graphql", j(query=query), "application/json"))
+        response_2 = view(rf.get(url_string(query=introspection_query)))
+
+    mock.assert_not_called()
+    assert response.status_code == 200
+    assert response.content == response_2.content
+    assert response_json(response) == {"data": schema.introspect()}
+
+
+def test_introspection_cache_uses_introspection_file(rf, tmpdir):
+    from graphql.utils.introspection_query import introspection_query
+
+    from ..introspection import clear_introspection_results
+    from ..views import GraphQLView
+    from .schema_view import schema
+
+    clear_introspection_results()
+    introspection_file = tmpdir.join("schema.json")
+    introspection_file.write(json.dumps({"data": {"__schema": {}}}))
+    view = GraphQLView.as_view(
+        schema=schema,
+        introspection_cache=True,
+        introspection_file=str(introspection_file),
+    )
+
+    response = view(rf.get(url_string(query=introspection_query)))
+    assert response_json(response) == {"data": {"__schema": {}}}
+
+
+def test_introspection_cache_ignores_other_queries(rf):
+    from ..views import GraphQLView
+    from .schema_view import schema
+
+    view = GraphQLView.as_view(schema=schema, introspection_cache=True)
+    response = view(rf.get(url_string(query="{ __schema { queryType { name } } }")))
+    assert response_json(response) == {
+        "data": {"__schema": {"queryType": {"name": "QueryRoot"}}}
+    }
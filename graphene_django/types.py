@@ -2,6 +2,7 @@ import warnings
 from collections import OrderedDict
 
 import six
+from django.core.exceptions import ValidationError
 from django.db.models import Model
 from django.utils.functional import SimpleLazyObject
 
@@ -11,7 +12,11 @@ from graphene.relay import Connection, Node
 from graphene.types.objecttype import ObjectType, ObjectTypeOptions
 from graphene.types.utils import yank_fields_from_attrs
 
+from .annotations import annotate_queryset, get_annotated_fields
+from .cache import NodeCache
 from .converter import convert_django_field_with_choices
+from .identity_map import get_identity_map
+from .prefetch import filter_prefetched
 from .registry import Registry, get_global_registry
 from .settings import graphene_settings
 from .utils import (
@@ -20,10 +25,16 @@ from .utils import (
     get_model_fields,
     is_valid_django_model,
 )
+from .values import ValuesRow
 
 if six.PY3:
     from typing import Type
 
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
 
 ALL_FIELDS = "__all__"
 
@@ -133,6 +144,67 @@ def validate_fields(type_, model, fields, only_fields, exclude_fields):
                 )
 
 
+class LazyFields(MutableMapping):
+    """
+    Ordered mapping of the fields of a DjangoObjectType which only converts
+    the model fields (and validates them) the first time it is read.
+
+    Updates made before that, such as the fields declared on the class, are
+    replayed on top of the converted model fields.
+    """
+
+    def __init__(self, build, validate):
+        self._build = build
+        self._validate = validate
+        self._updates = []
+        self._fields = None
+
+    @property
+    def built(self):
+        return self._fields is not None
+
+    def get_fields(self):
+        if self._fields is None:
+            fields = self._build()
+            for update in self._updates:
+                fields.update(update)
+            self._fields = fields
+            self._updates = None
+            self._validate(fields)
+        return self._fields
+
+    def update(self, *args, **kwargs):
+        if self._fields is None:
+            self._updates.append(OrderedDict(*args, **kwargs))
+        else:
+            self._fields.update(*args, **kwargs)
+
+    def __bool__(self):
+        return True
+
+    __nonzero__ = __bool__
+
+    def __getitem__(self, key):
+        return self.get_fields()[key]
+
+    def __setitem__(self, key, value):
+        self.get_fields()[key] = value
+
+    def __delitem__(self, key):
+        del self.get_fields()[key]
+
+    def __iter__(self):
+        return iter(self.get_fields())
+
+    def __len__(self):
+        return len(self.get_fields())
+
+    def __repr__(self):
+        if self._fields is None:
+            return "<LazyFields (not built)>"
+        return repr(self._fields)
+
+
 class DjangoObjectTypeOptions(ObjectTypeOptions):
     model = None  # type: Model
     registry = None  # type: Registry
@@ -140,6 +212,11 @@ class DjangoObjectTypeOptions(ObjectTypeOptions):
 
     filter_fields = ()
     filterset_class = None
+    identity_map = None
+    cache = None  # type: NodeCache
+    # Whether the instances of a class can be resolved to this type
+    compatible_classes = None  # type: Dict[type, bool]
+    annotated_fields = None  # type: Dict[str, DjangoAnnotatedField]
 
 
 class DjangoObjectType(ObjectType):
@@ -160,6 +237,9 @@ class DjangoObjectType(ObjectType):
         use_connection=None,
         interfaces=(),
         convert_choices_to_enum=True,
+        lazy_fields=None,
+        identity_map=None,
+        cache=None,
         _meta=None,
         **options
     ):
@@ -223,10 +303,24 @@ class DjangoObjectType(ObjectType):
                 % type(exclude).__name__
             )
 
-        django_fields = yank_fields_from_attrs(
-            construct_fields(model, registry, fields, exclude, convert_choices_to_enum),
-            _as=Field,
-        )
+        def build_django_fields():
+            return yank_fields_from_attrs(
+                construct_fields(
+                    model, registry, fields, exclude, convert_choices_to_enum
+                ),
+                _as=Field,
+            )
+
+        def validate_django_fields(django_fields):
+            validate_fields(cls, model, django_fields, fields, exclude)
+
+        if lazy_fields is None:
+            lazy_fields = graphene_settings.DJANGO_OBJECT_TYPE_LAZY_FIELDS
+
+        if lazy_fields:
+            django_fields = LazyFields(build_django_fields, validate_django_fields)
+        else:
+            django_fields = build_django_fields()
 
         if use_connection is None and interfaces:
             use_connection = any(
@@ -256,13 +350,20 @@ class DjangoObjectType(ObjectType):
         _meta.filterset_class = filterset_class
         _meta.fields = django_fields
         _meta.connection = connection
+        _meta.identity_map = identity_map
+        _meta.compatible_classes = {model: True}
+        _meta.annotated_fields = get_annotated_fields(cls)
+        for name, annotated_field in _meta.annotated_fields.items():
+            annotated_field.bind(model, name)
+        if cache is not None:
+            _meta.cache = NodeCache(model, options.get("name") or cls.__name__, **cache)
 
         super(DjangoObjectType, cls).__init_subclass_with_meta__(
             _meta=_meta, interfaces=interfaces, **options
         )
 
-        # Validate fields
-        validate_fields(cls, model, _meta.fields, fields, exclude)
+        if not lazy_fields:
+            validate_django_fields(_meta.fields)
 
         if not skip_registry:
             registry.register(cls)
@@ -272,29 +373,105 @@ class DjangoObjectType(ObjectType):
 
     @classmethod
     def is_type_of(cls, root, info):
-        if isinstance(root, cls):
-            return True
-        if not is_valid_django_model(root.__class__):
-            raise Exception(('Received incompatible instance "{}".').format(root))
-
-        if cls._meta.model._meta.proxy:
-            model = root._meta.model
-        else:
-            model = root._meta.model._meta.concrete_model
+        # Called for every object resolved to this type or to an interface or
+        # union it belongs to, so the checks are only made once per class
+        compatible = cls._meta.compatible_classes.get(root.__class__)
+        if compatible is None:
+            if isinstance(root, cls):
+                return True
+            if isinstance(root, ValuesRow):
+                compatible = root.model == cls._meta.model
+                cls._meta.compatible_classes[root.__class__] = compatible
+                return compatible
+            if not is_valid_django_model(root.__class__):
+                raise Exception(('Received incompatible instance "{}".').format(root))
+
+            if cls._meta.model._meta.proxy:
+                model = root._meta.model
+            else:
+                model = root._meta.model._meta.concrete_model
 
-        return model == cls._meta.model
+            compatible = model == cls._meta.model
+            cls._meta.compatible_classes[root.__class__] = compatible
+        return compatible
 
     @classmethod
     def get_queryset(cls, queryset, info):
         return queryset
 
+    @classmethod
+    def resolve_prefetched(cls, queryset, info):
+        """
+        Return the instances of `queryset`, prefetched by `prefetch_related`,
+        that `get_queryset` would return, or None to query them again. Only
+        simple filters of `get_queryset` are applied in Python, override it
+        for the others.
+        """
+        return filter_prefetched(queryset, cls.get_queryset(queryset, info))
+
     @classmethod
     def get_node(cls, info, id):
-        queryset = cls.get_queryset(cls._meta.model.objects, info)
-        try:
-            return queryset.get(pk=id)
-        except cls._meta.model.DoesNotExist:
-            return None
+        identity_map = get_identity_map(info, cls)
+        if identity_map is not None:
+            node = identity_map.get(cls._meta.model, id)
+            if node is not None:
+                return node
+
+        cache = cls._meta.cache
+        node = cache.get(info, id) if cache is not None else None
+        if node is None:
+            queryset = cls.get_queryset(cls._meta.model.objects, info)
+            queryset = annotate_queryset(queryset, cls, info)
+            try:
+                node = queryset.get(pk=id)
+            except cls._meta.model.DoesNotExist:
+                return None
+            if cache is not None:
+                cache.set_many(info, [node])
+        return identity_map.add(node) if identity_map is not None else node
+
+    @classmethod
+    def get_nodes(cls, info, ids):
+        """
+        Return the nodes of `ids` in the same order, None for the missing
+        ones, fetching them with a single query.
+        """
+        model = cls._meta.model
+        to_python = model._meta.pk.to_python
+        pks = []
+        for id in ids:
+            try:
+                pks.append(to_python(id))
+            except ValidationError:
+                pks.append(None)
+
+        identity_map = get_identity_map(info, cls)
+        nodes = {}
+        if identity_map is not None:
+            for pk in pks:
+                node = identity_map.get(model, pk) if pk is not None else None
+                if node is not None:
+                    nodes[pk] = node
+
+        cache = cls._meta.cache
+        missing = [pk for pk in pks if pk is not None and pk not in nodes]
+        if missing and cache is not None:
+            cached = cache.get_many(info, missing)
+            if identity_map is not None:
+                cached = {pk: identity_map.add(node) for pk, node in cached.items()}
+            nodes.update(cached)
+            missing = [pk for pk in missing if pk not in nodes]
+        if missing:
+            queryset = annotate_queryset(
+                cls.get_queryset(model.objects, info), cls, info
+            )
+            queryset = list(queryset.filter(pk__in=missing))
+            if cache is not None:
+                cache.set_many(info, queryset)
+            if identity_map is not None:
+                queryset = identity_map.add_all(queryset)
+            nodes.update((node.pk, node) for node in queryset)
+        return [nodes.get(pk) for pk in pks]
 
 
 class ErrorType(ObjectType):
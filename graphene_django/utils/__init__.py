@@ -2,7 +2,9 @@ from .testing import GraphQLTestCase
 from .utils import (
     DJANGO_FILTER_INSTALLED,
     camelize,
+    from_global_ids,
     get_model_fields,
+    get_selected_field_names,
     get_reverse_fields,
     import_single_dispatch,
     is_valid_django_model,
@@ -14,7 +16,9 @@ __all__ = [
     "get_reverse_fields",
     "maybe_queryset",
     "get_model_fields",
+    "get_selected_field_names",
     "camelize",
+    "from_global_ids",
     "is_valid_django_model",
     "import_single_dispatch",
     "GraphQLTestCase",
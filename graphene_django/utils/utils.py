@@ -1,4 +1,6 @@
+import binascii
 import inspect
+from base64 import b64decode
 
 import six
 from django.db import connection, models, transaction
@@ -7,6 +9,7 @@ from django.utils.encoding import force_text
 from django.utils.functional import Promise
 
 from graphene.utils.str_converters import to_camel_case
+from graphql.language.ast import FragmentSpread, InlineFragment
 
 try:
     import django_filters  # noqa
@@ -58,21 +61,80 @@ def maybe_queryset(value):
     return value
 
 
-def get_model_fields(model):
-    local_fields = [
-        (field.name, field)
-        for field in sorted(
-            list(model._meta.fields) + list(model._meta.local_many_to_many)
-        )
-    ]
+_model_fields_cache = {}
+
 
-    # Make sure we don't duplicate local fields with "reverse" version
-    local_field_names = [field[0] for field in local_fields]
-    reverse_fields = get_reverse_fields(model, local_field_names)
+def get_model_fields_signature(model):
+    # Django expires the `_meta` field caches whenever a model relating to
+    # `model` is registered, which is also when the reverse relation
+    # descriptors inspected by `get_reverse_fields` get added to it.
+    return model, len(model._meta.get_fields(include_hidden=True))
 
-    all_fields = local_fields + list(reverse_fields)
 
-    return all_fields
+def get_model_fields(model):
+    signature = get_model_fields_signature(model)
+    all_fields = _model_fields_cache.get(signature)
+    if all_fields is None:
+        local_fields = [
+            (field.name, field)
+            for field in sorted(
+                list(model._meta.fields) + list(model._meta.local_many_to_many)
+            )
+        ]
+
+        # Make sure we don't duplicate local fields with "reverse" version
+        local_field_names = [field[0] for field in local_fields]
+        reverse_fields = get_reverse_fields(model, local_field_names)
+
+        all_fields = local_fields + list(reverse_fields)
+        _model_fields_cache[signature] = all_fields
+
+    return list(all_fields)
+
+
+def from_global_ids(global_ids):
+    """
+    Decode a list of Relay global IDs in a single pass and return their
+    (type name, id) pairs. Raises ValueError with the first invalid global
+    ID as argument.
+    """
+    pairs = []
+    append = pairs.append
+    for global_id in global_ids:
+        try:
+            _type, _id = b64decode(global_id).decode("utf-8").split(":", 1)
+        except (TypeError, ValueError, UnicodeDecodeError, binascii.Error):
+            raise ValueError(global_id)
+        if not _type.strip() or not _id.strip():
+            raise ValueError(global_id)
+        append((_type, _id))
+    return pairs
+
+
+def get_selected_field_names(info, path=()):
+    """
+    Return the names of the fields selected on the field being resolved,
+    including the ones selected through fragments. `path` is a sequence of
+    field names to follow first, e.g. `("edges", "node")`.
+    """
+    names = []
+
+    def collect(selection_set, path):
+        for selection in selection_set.selections:
+            if isinstance(selection, FragmentSpread):
+                collect(info.fragments[selection.name.value].selection_set, path)
+            elif isinstance(selection, InlineFragment):
+                collect(selection.selection_set, path)
+            elif path:
+                if selection.name.value == path[0] and selection.selection_set:
+                    collect(selection.selection_set, path[1:])
+            elif selection.name.value not in names:
+                names.append(selection.name.value)
+
+    for field_ast in info.field_asts:
+        if field_ast.selection_set:
+            collect(field_ast.selection_set, tuple(path))
+    return names
 
 
 def is_valid_django_model(model):
@@ -0,0 +1,135 @@
+import six
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.query import ModelIterable, QuerySet, ValuesIterable
+
+from graphene.utils.str_converters import to_camel_case
+
+from .utils import get_selected_field_names
+
+
+class ValuesRow(dict):
+    """
+    Row of `QuerySet.values()` resolved in place of a model instance. Its
+    columns can also be read as attributes, and `pk` reads the primary key.
+    """
+
+    model = None
+
+    def __getattr__(self, name):
+        if name == "pk":
+            name = self.model._meta.pk.attname
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+_row_classes = {}
+
+
+def get_row_class(model):
+    if model not in _row_classes:
+        _row_classes[model] = type(
+            str("{}ValuesRow".format(model.__name__)), (ValuesRow,), {"model": model}
+        )
+    return _row_classes[model]
+
+
+class ValuesRowIterable(ValuesIterable):
+    def __iter__(self):
+        row_class = get_row_class(self.queryset.model)
+        for row in super(ValuesRowIterable, self).__iter__():
+            yield row_class(row)
+
+
+def get_graphql_fields(django_object_type, info):
+    """
+    Return the fields of `django_object_type` by GraphQL name, as
+    (name, field) pairs.
+    """
+    auto_camelcase = getattr(info.schema, "auto_camelcase", True)
+    fields = {}
+    for name, field in django_object_type._meta.fields.items():
+        graphql_name = getattr(field, "name", None) or (
+            to_camel_case(name) if auto_camelcase else name
+        )
+        fields[graphql_name] = name, field
+    return fields
+
+
+def get_selected_model_fields(django_object_type, info, field_names):
+    """
+    Return the (GraphQL name, name, model field) of the concrete model fields
+    read by the default resolver for the fields `field_names` (GraphQL names)
+    of `django_object_type`, the primary key standing for `id`. Return None
+    if one of them has a custom resolver or isn't a concrete model field.
+    """
+    from .types import DjangoObjectType
+
+    model = django_object_type._meta.model
+    fields = get_graphql_fields(django_object_type, info)
+    default_resolve_id = six.get_unbound_function(DjangoObjectType.resolve_id)
+    model_fields = []
+    for graphql_name in field_names:
+        if graphql_name.startswith("__"):
+            continue
+        if graphql_name not in fields:
+            return None
+        name, field = fields[graphql_name]
+        if getattr(field, "resolver", None) is not None:
+            return None
+        resolver = getattr(django_object_type, "resolve_{}".format(name), None)
+        if name == "id":
+            if six.get_unbound_function(resolver) is not default_resolve_id:
+                return None
+            model_fields.append((graphql_name, name, model._meta.pk))
+            continue
+        if resolver is not None:
+            return None
+        try:
+            model_field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete or model_field.many_to_many:
+            return None
+        model_fields.append((graphql_name, name, model_field))
+    return model_fields
+
+
+def get_values_columns(django_object_type, info, field_names):
+    """
+    Return the columns holding the values of the fields `field_names`
+    (GraphQL names) of `django_object_type`, or None if one of them isn't a
+    column of the model resolved by the default resolver.
+    """
+    model_fields = get_selected_model_fields(django_object_type, info, field_names)
+    if model_fields is None:
+        return None
+    columns = [django_object_type._meta.model._meta.pk.attname]
+    for _, _, model_field in model_fields:
+        if model_field.is_relation:
+            return None
+        if model_field.attname not in columns:
+            columns.append(model_field.attname)
+    return columns
+
+
+def get_values_queryset(queryset, django_object_type, info, path=()):
+    """
+    Return `queryset` fetching `ValuesRow`s rather than model instances if
+    the fields selected on `path` from the field being resolved can all be
+    read from the columns of the model, `queryset` otherwise.
+    """
+    if (
+        not isinstance(queryset, QuerySet)
+        or queryset._iterable_class is not ModelIterable
+        or queryset._prefetch_related_lookups
+    ):
+        return queryset
+    field_names = get_selected_field_names(info, path)
+    columns = get_values_columns(django_object_type, info, field_names)
+    if columns is None:
+        return queryset
+    queryset = queryset.values(*columns)
+    queryset._iterable_class = ValuesRowIterable
+    return queryset
@@ -19,6 +19,7 @@ from graphql.type.schema import GraphQLSchema
 from graphql.execution.middleware import MiddlewareManager
 
 from graphene_django.constants import MUTATION_ERRORS_FLAG
+from graphene_django.introspection import get_introspection_result
 from graphene_django.utils.utils import set_rollback
 
 from .settings import graphene_settings
@@ -55,6 +56,34 @@ def instantiate_middleware(middlewares):
         yield middleware
 
 
+_middleware_managers = {}
+
+
+def get_middleware_manager(schema, middleware):
+    """
+    Return the MiddlewareManager wrapping ``middleware`` for ``schema``.
+
+    Managers are shared between the view instances Django creates for every
+    request, so the middleware chain built around each field resolver is
+    computed once per process instead of once per request.
+    """
+    middleware = tuple(middleware)
+    if not middleware:
+        return None
+
+    try:
+        key = (schema, middleware)
+        manager = _middleware_managers.get(key)
+    except TypeError:
+        # Unhashable middleware can't be shared, wrap it for this view only
+        return MiddlewareManager(*instantiate_middleware(middleware))
+
+    if manager is None:
+        manager = MiddlewareManager(*instantiate_middleware(middleware))
+        _middleware_managers[key] = manager
+    return manager
+
+
 class GraphQLView(View):
     graphiql_template = "graphene/graphiql.html"
 
@@ -87,6 +116,8 @@ class GraphQLView(View):
     pretty = False
     batch = False
     subscription_path = None
+    introspection_cache = False
+    introspection_file = None
 
     def __init__(
         self,
@@ -99,6 +130,8 @@ class GraphQLView(View):
         batch=False,
         backend=None,
         subscription_path=None,
+        introspection_cache=False,
+        introspection_file=None,
     ):
         if not schema:
             schema = graphene_settings.SCHEMA
@@ -114,7 +147,7 @@ class GraphQLView(View):
             if isinstance(middleware, MiddlewareManager):
                 self.middleware = middleware
             else:
-                self.middleware = list(instantiate_middleware(middleware))
+                self.middleware = get_middleware_manager(self.schema, middleware)
         self.executor = executor
         self.root_value = root_value
         self.pretty = self.pretty or pretty
@@ -123,6 +156,8 @@ class GraphQLView(View):
         self.backend = backend
         if subscription_path is None:
             self.subscription_path = graphene_settings.SUBSCRIPTION_PATH
+        self.introspection_cache = self.introspection_cache or introspection_cache
+        self.introspection_file = self.introspection_file or introspection_file
 
         assert isinstance(
             self.schema, GraphQLSchema
@@ -203,6 +238,19 @@ class GraphQLView(View):
     def get_response(self, request, data, show_graphiql=False):
         query, variables, operation_name, id = self.get_graphql_params(request, data)
 
+        if self.introspection_cache and query and not variables and not self.batch:
+            introspection_result = get_introspection_result(
+                self.schema, query, operation_name, self.introspection_file
+            )
+            if introspection_result is not None:
+                if self.pretty or show_graphiql or request.GET.get("pretty"):
+                    result = self.json_encode(
+                        request, introspection_result.response, pretty=show_graphiql
+                    )
+                else:
+                    result = introspection_result.content
+                return result, 200
+
         execution_result = self.execute_graphql_request(
             request, data, query, variables, operation_name, show_graphiql
         )